@@ -1,111 +1,37 @@
 import pygame # install in terminal with: pip install pygame
 from SpriteSheet import SpriteSheet
+from RobotArmEngine import RobotArmEngine, help, helpChallenge
 import os
 import sys
-import random
-import string
-import inspect
+import time
+from collections import deque
 from math import ceil, floor
 
-# RobotArm class ################################################
-help = '''
-  =================== RobotArm ===================
-  moves boxes from one spot to another...
-  
-  robotArm = RobotArm(challenge,level)
-    loads a challenge and displays its stacks of colored boxes
-  
-  methods to use with robotArm:
-
-  moveRight()
-    moves the robotarm one stack position to the right
-    returns True if succeeded, returns False if not possible
-
-  moveLeft()
-    moves the robotarm one stack position to the left
-    returns True if succeeded, returns False if not possible
-
-  grab()
-    lets the robotarm grab a box from the stack if there is one
-    returns True if succeeded, returns False if not possible
-
-  drop()
-    lets the robotarm drop its box to the stack if not full
-    returns True if succeeded, returns False if not possible
-
-  scan()
-    returns the color of the box at the robotarm
+_assets = {} # icon, sprites and fonts shared by all robotarms
 
-  stackEmpty()
-    returns True if stack under robotarm ie empty, else False
-
-  stackIndex() 
-    returns the current index (position) of the robotArm
-
-  showSolution()
-    displays the the solution (if available)
-
-  report()
-    reports the results of the mission (challenge and level) and then waits
-  
-  wait()
-    waits for the program window to continue 
-
-  operate()
-    makes the robotarm operate on keyboard-keys: LEFT, RIGHT and DOWN
-
-  help()
-    shows help in the terminal
-  
-  helpChallenge()
-    shows help in the terminal in creating challenges
-'''
-
-helpChallenge = '''
-=================== define challenges ===================
-
-  challenge example: 
-  {'name': 'collect boxes', 
-   'start' : 'gbg,,y,,br,,,,' , # defining the colors of boxes at spots separated by komma
-   'solution': ',,,,,,,,,gbgybr', # defining the colors of boxes at spots separated by komma
-   'levels':'2:20,3:20/29', # defining for levels: maximum code lines / maximum actions taken
-   'info': 'move all boxes to last spot' # detailed instructions to reach solution
-  }
-    
-    'start' defines the colors of boxes at spots separated by komma
-    'solution' defines the colors of boxes at spots separated by komma
-    'levels' defines for levels the levelnr: maximum code lines / maximum actions taken
-    'info' detailed instructions to reach solution
-
-    supported colors: 
-    w=white, g=green, r=red, b=blue, y=yellow, o=orange, p=purple, l=grey, n=black, t=transparent and i=invisible
-
-    examples of start stacks and solution stacks:
-
-      3y2r  -> 3 yellow boxes, 2 red boxes
-      *b    -> random number (0..5) of blue boxes
-      4?    -> 4 boxes of a random color from: red, green, blue or white
-      *p combined with 'symbols' : '*?2' -> random number (0..2) of purple boxes
-      x combined with 'symbols' : 'x?yyyybb' -> 1 box with a color random picked from collection yyyybb
-      4x combined with 'symbols' : 'x-rrrrggg' -> 4 boxes with a color once random picked from collection rrrrggg
-      #w#r#b combined with 'symbols' : '#+1' -> 1 white, 2 red, 3 blue boxes
-      #w,#r,#b combined with 'symbols' : '#-5' -> in subsequent stacks: 5 white, 4 red, 3 blue boxes
-
-    solutions based on a start with random colors or numbers can be defined by a function called with criteria:
-    'criteria' : 'r:6' -> all red boxes to be collected at spot 6
-    'criteria' : 'b>2' -> all blue boxes to be moved 2 positions to the right
-    'criteria' : 'w<1' -> all white boxes to be moved 1 position to the left
-    'criteria' : '2}4' -> all boxes on spot to be distributed to the right starting at spot 4
-    'criteria' : '3{8' -> all boxes on spot to be distributed to the left starting at spot 8
-'''
+class ShownState:
+  # copy of the engine state at one animation, for views that draw after the engine moved on
+  def __init__(self, engine):
+    self._yard = engine._yard.copy()
+    self._stack = engine._stack
+    self._color = engine._color
+    self._actions = engine._actions
+    self._accuCapacity = engine._accuCapacity
+    self._challengeName = getattr(engine, '_challengeName', '') # not before the first load
+    self._maxStacks = engine._maxStacks
+    self._maxLayers = engine._maxLayers
 
+# RobotArm class ################################################
+# displays a RobotArmEngine with pygame, as an observer of the engine
 class RobotArm:
-  version = '2.5'
+  version = RobotArmEngine.version
 # 2.1: incluses warnings for actions like hitting the borders
 # 2.2: includes flaw terminal warnings for pointless actions
 # 2.3: may grab once without warning from empty stack that was randomly sized
 # 2.3.1: added handling key UP en DOWN for speeding up and down, while running animations
 # 2.4: 
+# 2.6: logic moved to the headless RobotArmEngine, RobotArm only displays the engine
+#      speed RobotArm.TURBO applies actions instantly, without animations or delays
   _backgroundColor = (200,200,200)
   _transparentPenColor = list(_backgroundColor) # pencolor slightly different from background
   for i in range(3): _transparentPenColor[i] += 20 if _transparentPenColor[i] <= 235 else -20
@@ -123,15 +49,15 @@ class RobotArm:
     {"name": 't', 'color': False, 'des': 'transparent','pencolor':_transparentPenColor},
     {"name": 'l', 'color': (160,160,160), 'des': 'gray'},
   ]
-  _colorSet = [color['name'] for color in _colors]
-  _defaultChallenge = {'name': 'demo','start' : ',r','solution': 'r', 'levels': '1:10,2:10/6'}
-  _speeds = [{'fps': 100,'step': 1},{'fps': 150,'step': 2},{'fps': 250,'step': 4},{'fps': 400,'step': 5},{'fps': 500,'step': 10},{'fps': 500,'step': 20}]
-  EMPTY = ''
+  _defaultChallenge = RobotArmEngine._defaultChallenge
+  # seconds an action takes at each speed: a move of one stack, a lift of the arm down or up
+  _speeds = [{'move': 0.34,'lift': 1.0},{'move': 0.12,'lift': 0.4},{'move': 0.05,'lift': 0.15},{'move': 0.025,'lift': 0.08},{'move': 0.01,'lift': 0.03},{'move': 0.005,'lift': 0.015},{'move': 0,'lift': 0}]
+  TURBO = len(_speeds) - 1 # no animation at all: only a frame every _turboFrameActions actions and when waiting
+  _turboFrameActions = 0 # default of RobotArm(..., turboFrameActions), 0: only the final frame
+  EMPTY = RobotArmEngine.EMPTY
 
   _backgroundColorAccu = (0,0,0)
   _penColor = (0,0,0)
-  _maxStacks = 10
-  _maxLayers = 8
   _boxHeight = 29
   _boxWidth = 29
   _penWidth = 1
@@ -139,148 +65,152 @@ class RobotArm:
   _armTopHeight = 15
   _bottomMargin = 2
   _idleAnimationTime = 300
+  _frameRate = 120 # frames per second at most while animating; a slower computer draws fewer, an action takes as long
+  _catchUpTime = 0.1 # seconds an action may start in the past, when the previous one took longer than its duration
   _screenMargin = 3
-  _eventSleepTime = 300
-  _eventActiveCycles = 100
-  _actions = 0 # amount of actions done
+  _viewStacks = 20 # stacks in the window at most, a wider yard scrolls with the arm
+  _viewLayers = 12 # layers in the window at most, a deeper yard scrolls with the arm
+  _viewMargin = 2 # stacks between the arm and the edge of the window, while scrolling
+  _minimapHeight = 30 # overview of a yard that scrolls, below the yard
+  _eventTimeout = 250 # milliseconds a wait for keys blocks at most, so ctrl-c still works
+  _waitEventTypes = [pygame.QUIT, pygame.KEYDOWN, pygame.WINDOWEXPOSED] # other events do not wake up a wait
+  _keyRepeat = (250, 80) # operate: milliseconds before a held key repeats and between repeats, (0, 0): no repeat
+  _commandKeys = {pygame.K_LEFT: 'left', pygame.K_RIGHT: 'right', pygame.K_DOWN: 'down'}
+  _commandLimit = 20 # keys queued while the arm is busy, more are ignored
+  _coalesceMoves = True # queued moves in the same direction animate as one move
   _iconImage = 'robotarm.ico'
   _hazardSprite = 'caution-icon-hi.png'
   _hazardFont = 'FreeSansBold.ttf'
-  _previousAction = ''
   _accuWidth = 15
-  _accuCapacity = False
   _accuPadding = 5
   _accuColors = ((100,'g'),(50, 'y'),(25, 'o'),(10, 'r'))
-  _criticals = {'e':0,'w':0,'i':0}
-  _solutionDone = False
-  _missionReported = False
-  _aborted = False
-  _actionFlaws = [
-    ['left','right'],
-    ['right','left'],
-    ['drop','grab'],
-    ['grab','drop'],
-    ['scan','scan'],
-    ['drop','scan'],
-  ]
-  _knownEmpty = []
   MAXCAPTION = 24
+  _offscreen = False # draw on a surface without a window, delays and waiting for keys (robotArmExport.py)
 
-  def _count_lines_of_code(self):
-    current_frame = inspect.currentframe()
-    while current_frame.f_back:
-        current_frame = current_frame.f_back
-    caller_filename = inspect.getframeinfo(current_frame).filename
-    with open(caller_filename, 'r') as f:
-      lines = f.readlines()
-    num_lines = 0
-    for line in lines:
-      line = line.strip()
-      if line and not line.startswith("#") and not line.startswith("print(") and not line.startswith("input("):
-        num_lines += 1
-    return num_lines
-  
   def _internalError(self, info):
     print(f' ********* {info} *********')
     exit()
 
-  def _colored(self,text,color):
-    if color == 'red':
-      return "\033[1;31;40m" + text + "\033[0m"
-    elif color == 'green':
-      return "\033[1;32;40m" + text + "\033[0m"
-    elif color == 'blue':
-      return "\033[1;34;40m" + text + "\033[0m"
-    elif color == "yellow":
-      return "\033[1;33;40m" + text + "\033[0m"
-    elif color == "orange":
-      return "\033[1;38;2;255;165;0m" + text + "\033[0m"
-    else:
-      return text
-
-  def _missionInfo(self, state, info1, info2 = '', color='white'):
-
-    def formatLine(text, paddingLeft, length, char, color='white'):
-      before = paddingLeft * char 
-      after = (length - len(text)) * char
-      return '*' + before + self._colored(text,color) + after + '*'
-    
-    length = max(len(info1),len(info2))
-    padding = 5
-    totalLength = length + 2 * padding
-    title = ' MISSION ' + state + ' '
-    top = formatLine(title ,padding, totalLength, '*',color) 
-    bottom = formatLine('',padding, totalLength, '*')
-    space = formatLine('',padding, totalLength, ' ')
-    info1 = formatLine(info1,padding, totalLength, ' ')
-    if info2: info2 = formatLine(info2,padding, totalLength, ' ')
-    print(top)
-    print(space)
-    print(info1)
-    if info2: print(info2)
-    print(space)
-    print(bottom)
-
   def _setScreen(self):
-    self._screenWidth = self._stackX(self._maxStacks) + self._screenMargin 
-    self._screenHeight = self._layerY(-1) + self._bottomMargin + 2 * self._screenMargin
-    self._screen = pygame.display.set_mode((self._screenWidth + self._accuWidth, self._screenHeight))
-
-  def loadDims(self,challenge):
-    if not type(challenge) is dict: return
-    self._maxLayers = challenge.get('layers',self._maxLayers)
-    self._maxStacks = challenge.get('stacks',self._maxStacks)
-
-  def __init__(self, challenge = _defaultChallenge, level = 0):
-    self.loadDims(challenge)
-    self._color = self.EMPTY
-    self._stack = 0
-    self._yardBottom = self._armTopHeight + (self._maxLayers + 1) * self._boxSpaceHeight() + self._penWidth
-    self._armHeight = self._armTopHeight
-    self._armX = 0
-    self.speed = 1
-    self._yard = []
+    # the window shows at most _viewStacks by _viewLayers of the yard, the whole yard is the world
+    stacks = min(self._engine._maxStacks, self._viewStacks)
+    layers = min(self._engine._maxLayers, self._viewLayers)
+    self._screenWidth = self._stackX(stacks) + self._screenMargin
+    self._viewHeight = self._armTopHeight + (layers + 1) * self._boxSpaceHeight() + self._penWidth + self._bottomMargin + self._screenMargin
+    self._worldSize = (self._stackX(self._engine._maxStacks) + self._screenMargin, self._layerY(-1) + self._bottomMargin + 2 * self._screenMargin)
+    self._scrolls = self._worldSize != (self._screenWidth, self._viewHeight)
+    self._screenHeight = self._viewHeight + (self._minimapHeight if self._scrolls else 0)
+    size = (self._screenWidth + self._accuWidth, self._screenHeight)
+    self._screen = pygame.Surface(size) if self._offscreen else pygame.display.set_mode(size)
+
+  def __init__(self, challenge = _defaultChallenge, level = 0, speed = 1, seed = None, turboFrameActions = None):
+    self._engine = RobotArmEngine(None)
+    self._engine.loadDims(challenge)
+    self._initView(speed, turboFrameActions)
 
     pygame.init()
-    self._clock = pygame.time.Clock()
-
     self._setScreen()
 
-    assetsDir = os.path.dirname(os.path.realpath(__file__)) + '/'    # force assets to be found in directory of robotarm.py
-    try:
-      programIcon = pygame.image.load(assetsDir + self._iconImage)
-      pygame.display.set_icon(programIcon)
-      self._testImage = programIcon
-    except:
-      self._internalError(f'icon image: {self._iconImage} not found')
+    if not self._offscreen:
+      pygame.display.set_icon(self._getIcon())
 
-    try:
-      ss = SpriteSheet(assetsDir + self._hazardSprite)
-      self._hazardSign = ss.load_strip((0,0,64,64), 4, self._backgroundColor)
-    except:
-      self._internalError(f'hazard sprite: {self._hazardSprite} not found')
+    # Load level at creation
+    self._engine.addObserver(self)
+    self.load(challenge, level, seed)
 
-    try:
-      self._font = pygame.font.Font(assetsDir + self._hazardFont, 24)
-    except:
-      self._internalError(f'font: {self._hazardFont} not found')
+  def _initView(self, speed, turboFrameActions = None):
+    self._yardBottom = self._armTopHeight + (self._engine._maxLayers + 1) * self._boxSpaceHeight() + self._penWidth
+    self._armHeight = self._armTopHeight
+    self._armX = 0
+    self.speed = speed
+    self._captionState = None
+    self._boxCacheKey = None
+    self._dirtyArm = None
+    self._dirtyActions = 0
+    self._turboFrameAt = 0
+    self._turboFrameActions = self._turboFrameActions if turboFrameActions is None else turboFrameActions # of this arm, default: of the class
+    self._export = None
+    self._commands = None # queue of keys while operating
+    self._stopEvents = [] # spacebar or escape pressed while operating, for the wait after the queue
+    self._glide = 0 # moves left to animate as one
+    self._viewX = 0 # world position of the left top of the window
+    self._viewY = 0
+    self._dirtyView = None
+    self._minimap = None
+    self._minimapYard = None # copy of the yard the minimap shows
+    self._animationEnd = None # when the previous animation should have ended
+    self._time = 0 # seconds of animation drawn offscreen, the clock without a window
+
+########### ASSETS ###########
+
+  def _getAsset(self, key, loader, error):
+    # assets are loaded on first use and shared by all robotarms
+    if key not in _assets:
+      assetsDir = os.path.dirname(os.path.realpath(__file__)) + '/'    # force assets to be found in directory of robotarm.py
+      try:
+        _assets[key] = loader(assetsDir + key[1])
+      except:
+        self._internalError(error)
+    return _assets[key]
 
-    # Load level at creation
-    self.load(challenge, level)
+  def _getIcon(self):
+    return self._getAsset(('icon', self._iconImage), pygame.image.load, f'icon image: {self._iconImage} not found')
+
+  def _getHazardSign(self):
+    colorkey = type(self)._backgroundColor
+    loader = lambda path: SpriteSheet(path).load_strip((0,0,64,64), 4, colorkey)
+    return self._getAsset(('sprite', self._hazardSprite, colorkey), loader, f'hazard sprite: {self._hazardSprite} not found')
+
+  def _getFont(self, size = 24):
+    loader = lambda path: pygame.font.Font(path, size)
+    return self._getAsset(('font', self._hazardFont, size), loader, f'font: {self._hazardFont} not found')
+
+########### ENGINE OBSERVER ###########
+
+  def notify(self, engine, event, *args):
+    if event in ['left','right','down','up','load','solution','hazard']:
+      self._animate(event, *args)
+    elif event == 'accuEmpty':
+      self._backgroundColorAccu = (255,0,0)
+    elif event == 'wait':
+      self._wait(self._continue)
+    elif event == 'moves':
+      self._glide = args[0] if self.speed != self.TURBO else 0
 
 ########### ANIMATION METHODS ###########
 
+  def _checkBoxCache(self):
+    # color table and rendered boxes, rebuilt only when the palette or the box size changed,
+    # also when the palette is edited in place: the key holds its colors, not the list
+    palette = tuple((c['name'], tuple(c['color'] or ()), tuple(c.get('pencolor',self._penColor) or ())) for c in self._colors)
+    key = (palette, self._boxWidth, self._boxHeight, self._penWidth)
+    if self._boxCacheKey == key: return
+    self._boxCacheKey = key
+    self._colorCodes = {c['name']: (c['color'], c.get('pencolor',self._penColor)) for c in self._colors}
+    self._boxSurfaces = {}
+    for name, (color, pencolor) in self._colorCodes.items():
+      self._boxSurfaces[name] = self._renderBox(color, pencolor)
+
+  def _renderBox(self, color, pencolor):
+    if not color and not pencolor: return None
+    if color:
+      box = pygame.Surface((self._boxWidth, self._boxHeight))
+      box.fill(color)
+    else:
+      box = pygame.Surface((self._boxWidth, self._boxHeight), pygame.SRCALPHA)
+    if pencolor:
+      pygame.draw.rect(box, pencolor, (0, 0, self._boxWidth, self._boxHeight), self._penWidth)
+    if pygame.display.get_surface():
+      box = box.convert() if color else box.convert_alpha()
+    return box
+
   def _getColorCode(self, name):
-    for c in self._colors:
-      if c['name'] == name:
-        return c['color'], c.get('pencolor',self._penColor)
-    return False
-  
-  def _getColorDes(self,name):
-    for c in self._colors:
-      if c['name'] == name:
-        return c['des']
-    return ''   
+    self._checkBoxCache()
+    return self._colorCodes.get(name, False)
+
+  def _boxSurface(self, name):
+    self._checkBoxCache()
+    return self._boxSurfaces.get(name)
   
   def _checkSpeed(self):
     speedInvalid = False
@@ -292,11 +222,10 @@ class RobotArm:
       self.speed = 0 # reset speed to zero
       print('speed must be an integer between 0 and ' + str(len(self._speeds)-1))
 
-  def _drawBoxAtPosition(self, x, y, color, pencolor):
-    if color:
-      pygame.draw.rect(self._screen, color, (x, y, self._boxWidth, self._boxHeight))
-    if pencolor:
-      pygame.draw.rect(self._screen, pencolor, (x, y, self._boxWidth, self._boxHeight), self._penWidth)
+  def _drawBoxAtPosition(self, x, y, name):
+    box = self._boxSurface(name)
+    if box:
+      self._screen.blit(box, (x, y))
 
   def _boxSpaceWidth(self):
     return (self._boxWidth + 2 * self._boxMargin) + self._penWidth
@@ -311,44 +240,77 @@ class RobotArm:
     return self._yardBottom - (layer + 1) * self._boxSpaceHeight() - self._screenMargin
 
   def _drawBox(self, stack, layer):
-    x = self._stackX(stack) 
-    y = self._layerY(layer)
-    _color,_pencolor = self._getColorCode(self._yard[stack][layer])
-    self._drawBoxAtPosition(x,y,_color, _pencolor)
+    x = self._stackX(stack) - self._viewX
+    y = self._layerY(layer) - self._viewY
+    self._drawBoxAtPosition(x,y,self._engine._yard[stack][layer])
 
   def drawSpot(self, stack, color):
     x = self._stackX(stack) - self._boxMargin - self._penWidth
 
 
-  def _drawStack(self, stack):
-    for l in range(len(self._yard[stack])):
-      self._drawBox(stack,l)
-    x = self._stackX(stack) - self._boxMargin - self._penWidth
-    y = self._layerY(-1) + self._bottomMargin
+  def _stackBlits(self, stack, blits, layers):
+    x = self._stackX(stack) - self._viewX
+    column = self._engine._yard[stack]
+    for l in range(layers[0], min(layers[1], len(column))):
+      box = self._boxSurfaces.get(column[l])
+      if box:
+        blits.append((box, (x, self._layerY(l) - self._viewY)))
+
+  def _stacksIn(self, left, right):
+    # stacks drawn between world x left and right
+    first = max(0, (left - self._stackX(0)) // self._boxSpaceWidth() - 1)
+    last = min(len(self._engine._yard), (right - self._stackX(0)) // self._boxSpaceWidth() + 2)
+    return first, last
+
+  def _layersIn(self, top, bottom):
+    # layers drawn between world y top and bottom
+    base = self._layerY(-1)
+    return max(0, (base - bottom) // self._boxSpaceHeight() - 1), (base - top) // self._boxSpaceHeight() + 1
+
+  def _drawStackBase(self, stack):
+    x = self._stackX(stack) - self._boxMargin - self._penWidth - self._viewX
+    y = self._layerY(-1) + self._bottomMargin - self._viewY
 
     pygame.draw.lines(self._screen, self._penColor, False, [(x, y - 5), (x, y), (x + self._boxSpaceWidth(), y), (x + self._boxSpaceWidth(), y - 5)])
 
+  def _drawStacks(self, first, last):
+    # all boxes in one blits call, boxes and bases do not overlap
+    self._checkBoxCache()
+    blits = []
+    layers = self._layersIn(self._viewY, self._viewY + self._viewHeight)
+    for stack in range(first, last):
+      self._stackBlits(stack, blits, layers)
+    self._screen.blits(blits, False)
+    for stack in range(first, last):
+      self._drawStackBase(stack)
+
+  def _drawStack(self, stack):
+    self._drawStacks(stack, stack + 1)
+
   def _drawArm(self):
-    xm = self._armX + int(self._boxSpaceWidth()/2) - self._boxMargin
-    pygame.draw.line(self._screen, self._penColor, (xm, 2), (xm, self._armHeight - 2))
+    x = self._armX - self._viewX
+    y = self._armY()
+    xm = x + int(self._boxSpaceWidth()/2) - self._boxMargin
+    pygame.draw.line(self._screen, self._penColor, (xm, 2), (xm, y - 2))
     pygame.draw.lines(self._screen, self._penColor, False, [
-      (self._armX - self._boxMargin,                  self._armHeight + 2), 
-      (self._armX - self._boxMargin,                  self._armHeight - 2),
-      (self._armX + self._boxWidth + self._penWidth,  self._armHeight - 2),
-      (self._armX + self._boxWidth + self._penWidth , self._armHeight + 2)])
-    if self._color > '':
-      _color, _pencolor = self._getColorCode(self._color)
-      self._drawBoxAtPosition(self._armX,self._armHeight,_color,_pencolor)
+      (x - self._boxMargin,                  y + 2), 
+      (x - self._boxMargin,                  y - 2),
+      (x + self._boxWidth + self._penWidth,  y - 2),
+      (x + self._boxWidth + self._penWidth , y + 2)])
+    if self._engine._color > '':
+      self._drawBoxAtPosition(x,y,self._engine._color)
 
   def _drawAccu(self):
-    if self._accuCapacity ==  False: return
+    _accuCapacity = self._engine._accuCapacity
+    if _accuCapacity ==  False: return
     # pygame.draw.rect(self._screen, (0,150,0), (self._screenWidth, 0, self._accuWidth, self._screenHeight))
-    _stepsDone  = self._actions if self._actions < self._accuCapacity else self._accuCapacity
-    _accuOver = (self._accuCapacity - _stepsDone) / self._accuCapacity
-    _accuDone = _stepsDone / self._accuCapacity
+    _actions = self._engine._actions
+    _stepsDone  = _actions if _actions < _accuCapacity else _accuCapacity
+    _accuOver = (_accuCapacity - _stepsDone) / _accuCapacity
+    _accuDone = _stepsDone / _accuCapacity
     _accuPerc = ceil(_accuOver * 100)
 
-    pygame.draw.rect(self._screen, self._backgroundColorAccu, (self._screenWidth, 0, self._accuWidth, self._screenHeight))
+    pygame.draw.rect(self._screen, self._backgroundColorAccu, self._accuRect())
     _x0 = self._screenWidth + self._accuPadding
     _y0 = 0 + self._accuPadding
     _w0 = self._accuWidth - 2 * self._accuPadding
@@ -365,430 +327,362 @@ class RobotArm:
     pygame.draw.rect(self._screen, _color, (_x0, _y, _w0, _h))
     pass
 
+  def _drawCaption(self):
+    _actions = self._engine._actions
+    _name = self._engine._challengeName
+    if self._captionState == (_name, _actions): return
+    self._captionState = (_name, _actions)
+    steps = ' ['+ str(_actions)+']' if _actions > 0 else ''
+    if not self._offscreen:
+      pygame.display.set_caption(_name[0:self.MAXCAPTION] + steps)
+
+  def _armRect(self):
+    # area covered by the arm and the box it holds
+    return pygame.Rect(self._armX - self._viewX - self._boxMargin - 1, 0, self._boxWidth + self._penWidth + self._boxMargin + 3, self._armY() + self._boxHeight + 2)
+
+  def _accuRect(self):
+    return pygame.Rect(self._screenWidth, 0, self._accuWidth, self._screenHeight)
+
+  def _viewRect(self):
+    return pygame.Rect(0, 0, self._screenWidth, self._viewHeight)
+
+  def _followArm(self):
+    # scrolls the window with the arm, _viewMargin stacks from the sides; a deep yard
+    # from the top of the highest stack in view, or lower to keep the gripper in view
+    if not self._scrolls: return
+    margin = self._viewMargin * self._boxSpaceWidth()
+    x = min(max(self._viewX, self._armX + self._boxSpaceWidth() + margin - self._screenWidth), self._armX - margin)
+    self._viewX = max(0, min(x, self._worldSize[0] - self._screenWidth))
+    first, last = self._stacksIn(self._viewX, self._viewX + self._screenWidth)
+    highest = max(self._engine._yard.heights[first:last], default = 0)
+    y = max(self._layerY(highest - 1) - self._armTopHeight - 2 * self._boxHeight, self._armHeight + self._boxHeight + self._boxSpaceHeight() - self._viewHeight)
+    self._viewY = max(0, min(y, self._worldSize[1] - self._viewHeight))
+
+  def _armY(self):
+    # in the window: the arm hangs from the top of it when the yard scrolled down
+    return max(self._armHeight - self._viewY, self._armTopHeight)
+
   def _drawState(self):
-    steps = ' ['+ str(self._actions)+']' if self._actions > 0 else ''
-    _caption = self._challengeName[0:self.MAXCAPTION] + steps
-    pygame.display.set_caption(_caption)
+    # only the stacks in the window are drawn, however large the yard
+    self._drawCaption()
+    self._followArm()
     self._screen.fill(self._backgroundColor)
-    for c in range(len(self._yard)):
-      self._drawStack(c)
+    self._screen.set_clip(self._viewRect())
+    self._drawStacks(*self._stacksIn(self._viewX, self._viewX + self._screenWidth))
     self._drawArm()
+    self._screen.set_clip(None)
+    if self._scrolls:
+      self._updateMinimap()
+      self._drawMinimap()
     self._drawAccu()
+    self._dirtyArm = self._armRect()
+    self._dirtyActions = self._engine._actions
+    self._dirtyView = (self._viewX, self._viewY)
 
-  def _message(self, message = 'problem!', gravity = 1):
-    xm = self._armX + int(self._boxSpaceWidth()/2) - self._boxMargin - 31
-    ym = 0
+  def _drawRegion(self, rect):
+    # redraw only the yard within rect
+    self._screen.set_clip(rect.clip(self._viewRect()))
+    self._screen.fill(self._backgroundColor)
+    self._drawStacks(*self._stacksIn(rect.left + self._viewX, rect.right + self._viewX))
+    self._drawArm()
+    self._screen.set_clip(None)
+
+  ########### MINIMAP ###########
+  # the whole yard below a window that scrolls, a column of pixels shows the highest of the stacks it covers
+
+  def _minimapRect(self):
+    return pygame.Rect(0, self._viewHeight, self._screenWidth, self._minimapHeight)
+
+  def _updateMinimap(self):
+    # redraws the columns of the stacks that changed, True if any did
+    yard = self._engine._yard
+    shown = self._minimapYard
+    if shown is not None and shown.heights == yard.heights and shown.boxes == yard.boxes: return False
+    stack = self._engine._stack
+    if shown is not None and len(shown) == len(yard) and shown.layers == yard.layers and 0 <= stack < len(yard):
+      start = stack * yard.layers
+      shown.heights[stack] = yard.heights[stack]
+      shown.boxes[start:start + yard.layers] = yard.boxes[start:start + yard.layers]
+      if shown.heights == yard.heights and shown.boxes == yard.boxes: # only the stack of the arm changed
+        width = self._minimap.get_width()
+        self._drawMinimapColumns(max(0, stack * width // len(yard) - 1), min(width, (stack + 1) * width // len(yard) + 2))
+        return True
+    self._minimapYard = yard.copy()
+    if self._minimap is None:
+      self._minimap = pygame.Surface((self._screenWidth - 2 * self._screenMargin, self._minimapHeight - 2 * self._screenMargin))
+    self._drawMinimapColumns(0, self._minimap.get_width())
+    return True
 
-    text = self._font.render(message, True, (200,50,50), self._backgroundColor)
-    for l in range(12):
+  def _drawMinimapColumns(self, first, last):
+    yard = self._minimapYard
+    width, rows = self._minimap.get_size()
+    stacks = len(yard)
+    self._minimap.fill(self._backgroundColor, (first, 0, last - first, rows))
+    if not stacks: return
+    self._checkBoxCache()
+    for x in range(first, last):
+      start = x * stacks // width
+      end = max(start + 1, (x + 1) * stacks // width)
+      height = max(yard.heights[start:end])
+      column = yard[yard.heights.index(height, start, end)]
+      for layer in range(height):
+        top = rows - (layer + 1) * rows // yard.layers
+        bottom = rows - layer * rows // yard.layers
+        if bottom > top:
+          color, pencolor = self._colorCodes.get(column[layer], (None, None))
+          self._minimap.fill(color or pencolor or self._penColor, (x, top, 1, bottom - top))
+
+  def _drawMinimap(self):
+    rect = self._minimapRect()
+    self._screen.fill(self._backgroundColor, rect)
+    pygame.draw.line(self._screen, self._penColor, rect.topleft, (rect.right - 1, rect.top))
+    x0, y0 = rect.left + self._screenMargin, rect.top + self._screenMargin
+    self._screen.blit(self._minimap, (x0, y0))
+    width, height = self._minimap.get_size()
+    worldWidth, worldHeight = self._worldSize
+    left = self._viewX * width // worldWidth
+    top = self._viewY * height // worldHeight
+    view = pygame.Rect(x0 + left, y0 + top, max(3, (self._viewX + self._screenWidth) * width // worldWidth - left), max(3, (self._viewY + self._viewHeight) * height // worldHeight - top))
+    pygame.draw.rect(self._screen, self._penColor, view, 1)
+
+  def _drawFrame(self, milliseconds = None):
+    # draws the changes since the previous frame and updates only those parts of the display
+    if self._dirtyArm is None:
+      self._drawState()
+      self._update(None, milliseconds)
+      return
+    self._drawCaption()
+    self._followArm()
+    if self._dirtyView != (self._viewX, self._viewY): # scrolled: everything moved
       self._drawState()
-      if gravity == 1: self._screen.blit(self._hazardSign[l % 4],(xm,ym))
-      if l%2 == 0 or l >= 6:
-        self._screen.blit(text, ((self._screenWidth//2) - text.get_rect().width//2,60))
-      pygame.display.update()
-      pygame.time.delay(100)
+      self._update(None, milliseconds)
+      return
+    armRect = self._armRect()
+    dirty = [armRect.union(self._dirtyArm)]
+    self._drawRegion(dirty[0])
+    self._dirtyArm = armRect
+    if self._dirtyActions != self._engine._actions:
+      self._dirtyActions = self._engine._actions
+      self._drawAccu()
+      dirty.append(self._accuRect())
+    if self._scrolls and self._updateMinimap():
+      self._drawMinimap()
+      dirty.append(self._minimapRect())
+    self._update(dirty, milliseconds)
+
+  def _update(self, rects = None, milliseconds = None):
+    # shows the drawn frame, for about milliseconds; None: a single frame
+    if not self._offscreen:
+      if rects: pygame.display.update(rects)
+      else: pygame.display.update()
+    if self._export:
+      self._export.frame(self._screen, milliseconds)
+
+  def _drawMessage(self, message, frame, gravity = 1):
+    # frame 0..11 of the blinking message with the hazard sign above the arm
+    xm = self._armX - self._viewX + int(self._boxSpaceWidth()/2) - self._boxMargin - 31
+    ym = 0
 
+    text = self._getFont(24).render(message, True, (200,50,50), self._backgroundColor)
+    hazardSign = self._getHazardSign()
     self._drawState()
-    pygame.display.update()
-
-  def _handleHazard(self, message = 'problem!'):
-    self._message(message, 1)
-    self._log(message,'e')
-
-  def _log(self, message, cat):
-    if self._level in [0] and cat == 'e': return
-    if self._level in [0,1,2] and cat == 'w': return
-    markup = {'w':{'title':'warning','color':'orange'},'i':{'title':'info   ','color':'white'},'e': {'title':'error  ','color':'red'}}
-    title = self._colored(markup[cat]['title'],markup[cat]['color'])
-    print(f'{title}: {message}')
-    self._criticals[cat] += 1
+    if gravity == 1: self._screen.blit(hazardSign[frame % 4],(xm,ym))
+    if frame%2 == 0 or frame >= 6:
+      self._screen.blit(text, ((self._screenWidth//2) - text.get_rect().width//2,60))
+
+  def _turboFrame(self, final = False):
+    _actions = self._engine._actions
+    if not final and (self._turboFrameActions < 1 or _actions - self._turboFrameAt < self._turboFrameActions): return
+    self._turboFrameAt = _actions
+    self._handleEvents()
+    self._armX = self._stackX(self._engine._stack)
+    self._armHeight = self._armTopHeight
+    self._drawState()
+    self._update()
 
-  def _animate(self, *args):
+  def _animate(self, event, *args):
+    # the arm moves by the time passed: an action takes its duration, however many frames are drawn
     self._checkSpeed()
-    self._armX = self._stackX(self._stack)
-
-    if (args[0] == 'down'):
+    if self.speed == self.TURBO:
+      if event != 'hazard':
+        self._startAnimation(event)
+        self._turboFrame(event in ['load','solution','idle'])
+      return
+    if event in ['left','right'] and self._glide > 1:
+      self._glide -= 1 # the arm stays, the last move of the glide animates all of them
+      return
+    armX = self._armX
+    self._startAnimation(event)
+    if self._glide and event in ['left','right']:
+      self._from = self._armX = armX
+    self._glide = 0
+
+    duration = self._animationDuration(event)
+    now = self._now()
+    if self._animationEnd is not None and now - self._animationEnd < self._catchUpTime:
+      now = self._animationEnd # behind or computed in between: continue where the previous action ended
+    start = now
+    end = start + duration
+    static = event in ['load','solution','idle']
+    interval = 0.1 if event == 'hazard' else 1 / self._frameRate # the message blinks 10 times a second
+    while True:
+      self._handleEvents()
+      now = self._now()
+      elapsed = min(now - start, duration)
+      if static:
+        self._drawState()
+        self._update(None, 1000 * duration)
+        self._sleepUntil(end)
+        break
+      if now < end + interval or elapsed == 0: # more than a frame behind: skipped
+        self._moveArm(event, elapsed)
+        milliseconds = 1000 * min(interval, duration - elapsed)
+        if event == 'hazard':
+          self._drawMessage(args[0], min(11, int(elapsed / 0.1)))
+          self._update(None, milliseconds)
+        else:
+          self._drawFrame(milliseconds)
+      if now >= end: break
+      self._sleepUntil(min(now + interval, end))
+    self._endAnimation(event)
+    self._animationEnd = end
+    if event == 'hazard':
+      self._drawState()
+      self._update()
+
+  def _now(self):
+    return self._time if self._offscreen else time.perf_counter()
+
+  def _sleepUntil(self, moment):
+    if self._offscreen:
+      self._time = max(self._time, moment) # no delays: the clock just moves on
+      return
+    delay = moment - time.perf_counter()
+    if delay > 0:
+      time.sleep(delay)
+
+  ########### TIMED ANIMATION ###########
+  # an engine event as a movement of the arm over a duration, drawn at any time in between
+
+  def _queuedGlide(self, engine, event, args):
+    # for views that queue animations: the args to queue a move with, None for the moves of a glide before
+    # its last, which is queued with the stack the glide started at and animates all of them
+    if event == 'moves':
+      self._glide = args[0]
+      self._glideStack = engine._stack
+      return None
+    if event in ['left','right'] and self._glide:
+      self._glide -= 1
+      return None if self._glide else (self._glideStack,)
+    return args
+
+  def _startAnimation(self, event, args = ()):
+    # from the state of _engine at the event, a glide from the stack in args
+    self._checkSpeed()
+    _stack = self._engine._stack
+    self._armX = self._stackX(_stack)
+    if event in ['left','right']:
+      if args:
+        self._armX = self._stackX(args[0])
+      self._from, self._to = self._armX, self._stackX(_stack + (1 if event == 'right' else -1))
+    elif event == 'down':
+      targetLayer = self._engine._yard.height(_stack) - (1 if self._engine._color == self.EMPTY else 0)
+      self._from, self._to = self._armTopHeight, self._layerY(targetLayer)
+    elif event == 'up':
+      self._from, self._to = self._armHeight, self._armTopHeight
+    elif event == 'load':
       self._armHeight = self._armTopHeight
-      targetLayer = len(self._yard[self._stack])
-      if self._color == '':
-        targetLayer -= 1
-      targetHeight = self._layerY(targetLayer)
-    elif (args[0] == 'left'):
-      targetX = self._stackX(self._stack - 1)
-    elif (args[0] == 'right'):
-      targetX = self._stackX(self._stack + 1)
-
-    ready = False
-    while not ready:
-      if (args[0] == 'idle'):
-        ready = True
-      elif (args[0] == 'down'):
-        ready = self._armHeight == targetHeight
-      elif (args[0] == 'up'):
-        ready = self._armHeight == self._armTopHeight
-      elif (args[0] == 'left') or (args[0] == 'right'):
-        ready = self._armX == targetX
-
-      for event in pygame.event.get():
-        self.checkCloseEvent(event)
-        self.handleSpeedEvent(event)
+    elif event == 'solution':
+      self._backgroundColor = (250,250,100)
+    elif event == 'accuEmpty':
+      self._backgroundColorAccu = (255,0,0)
+
+  def _animationDuration(self, event):
+    # seconds, from the speed: the same in every window size and at every frame rate
+    if self.speed == self.TURBO:
+      return 0
+    if event in ['left','right']:
+      return self._speeds[self.speed]['move'] * abs(self._to - self._from) / self._boxSpaceWidth()
+    if event in ['down','up']:
+      return self._speeds[self.speed]['lift']
+    if event == 'hazard':
+      return 1.2
+    if event in ['load','solution','idle']:
+      return self._idleAnimationTime / 1000
+    return 0
+
+  def _endAnimation(self, event):
+    if event in ['left','right']:
+      self._armX = self._to
+    elif event in ['down','up']:
+      self._armHeight = self._to
+
+  def _moveArm(self, event, elapsed):
+    # the arm where it is elapsed seconds after the start of the animation
+    if event in ['left','right','down','up']:
+      duration = self._animationDuration(event)
+      position = self._from + (self._to - self._from) * min(1, elapsed / duration) if duration else self._to
+      if event in ['left','right']:
+        self._armX = round(position)
+      else:
+        self._armHeight = round(position)
 
+  def _drawAnimation(self, event, args, elapsed):
+    self._moveArm(event, elapsed)
+    if event == 'hazard':
+      self._drawMessage(args[0], min(11, int(elapsed / 0.1)))
+    else:
       self._drawState()
-      pygame.display.update()
-
-      self._clock.tick(self._speeds[self.speed]['fps'])
-
-      if (args[0] == 'down'):
-        self._armHeight += self._speeds[self.speed]['step']
-        if self._armHeight > targetHeight:
-          self._armHeight = targetHeight
-      elif (args[0] == 'up'):
-        self._armHeight -= self._speeds[self.speed]['step']
-        if self._armHeight < self._armTopHeight:
-          self._armHeight = self._armTopHeight
-      elif (args[0] == 'left'):
-        self._armX -= self._speeds[self.speed]['step']
-        if self._armX < targetX:
-          self._armX = targetX
-      elif (args[0] == 'right'):
-        self._armX += self._speeds[self.speed]['step']
-        if self._armX > targetX:
-          self._armX = targetX
-      elif (args[0] == 'idle'):
-        pygame.time.delay(self._idleAnimationTime)
-
-  def _hasActionsLeft(self):
-    return self._accuCapacity == False or (self._accuCapacity - self._actions) > 0
-
-  def _checkAccu(self):
-    if not self._hasActionsLeft():
-      if self._accuEmpty:
-        self._wait(self._continue)
-      if self._accuEmpty == False: 
-        self._log('accu empty, use spacebar to proceed, escape to abort','w')
-        self._backgroundColorAccu = (255,0,0)
-        self._accuEmpty = True
-      self._log('action, but accu empty','w')
-    self._actions += 1
-
-  def _checkFlaws(self, action):
-    for flaw in self._actionFlaws:
-      if (self._previousAction == flaw[0] and action == flaw[1]):
-        flawText = f'{flaw[1]} after {flaw[0]}'
-        self._log(f'action pointless: {flawText}?','w')
-    self._previousAction = action
-    if self._solutionDone and self._scans > self._scansMax:
-      self._log(f'needless action after solution','w')
 
   ########### ROBOTARM MANIPULATION ###########
   def moveRight(self):
-    if self._aborted: return
-    self._checkAccu()
-    self._checkFlaws('right')
-    success = False
-    if self._stack < self._maxStacks - 1:
-      self._animate('right')
-      self._stack += 1
-      success = True
-    else:
-      self._handleHazard('hit right border!')
-    return success
+    return self._engine.moveRight()
 
   def moveLeft(self):
-    if self._aborted: return
-    self._checkAccu()
-    self._checkFlaws('left')
-    success = False
-    if self._stack > 0:
-      self._animate('left')
-      self._stack -= 1
-      success = True
-    else:
-      self._handleHazard('hit left border!')
-    return success
+    return self._engine.moveLeft()
 
   def grab(self):
-    if self._aborted: return
-    self._checkAccu()
-    self._checkFlaws('grab')
-    success = False
-    if self._color == self.EMPTY:
-      self._animate('down')
-      if len(self._yard[self._stack]) > 0:
-        self._color = self._yard[self._stack][-1]
-        if self._color == 'i':
-          self._color = 't'
-        self._yard[self._stack].pop(-1)
-        success = True
-      else:
-        if self._knownEmpty[self._stack]:
-          self._handleHazard('nothing to grab!')
-        else:
-          self._knownEmpty[self._stack] = True
-      self._animate('up')
-    else:
-      self._handleHazard('robot arm occupied!')
-    return success
+    return self._engine.grab()
 
   def drop(self):
-    if self._aborted: return
-    self._checkAccu()
-    self._checkFlaws('drop')
-    success = False
-    if self._color != self.EMPTY:
-      if len(self._yard[self._stack]) < self._maxLayers:
-        self._animate('down')
-        self._yard[self._stack].append(self._color)
-        self._color = self.EMPTY
-        self._animate('up')
-        success = True
-      else:
-        self._handleHazard('stack full!')
-    else:
-      self._handleHazard('no box to drop!')
-    self._watchSolution()
-    return success
+    return self._engine.drop()
 
   def scan(self):
-    if self._aborted: return
-    self._checkAccu()
-    self._checkFlaws('scan')
-    self._scans += 1
-    return self._getColorDes(self._color)
+    return self._engine.scan()
+
+  def execute(self, actions, strict = False):
+    return self._engine.execute(actions, strict)
   
   def stackEmpty(self):
-    return len(self._yard[self._stack]) == 0
+    return self._engine.stackEmpty()
   
   def stackIndex(self):
-    return self._stack
+    return self._engine.stackIndex()
 
-########### LEVEL & YARD lOADING & CREATION ###########
+########### LEVEL & YARD lOADING ###########
 
-  def _isSolution(self):
-    serializedYard = self.serializeYard(self._yard)
-    
-    if type(self._solution) is str:
-      if self._solution == serializedYard:
-        return True
-      else:
-        return False
-    elif callable(self._solution):
-      return self._solution(self._yardStart, serializedYard, self._criteria)
-    
-  def _watchSolution(self):
-    if self._isSolution():
-      self._backgroundColor = (250,250,100)
-      self._solutionDone = True
-      self._animate('idle')
-      
-  def constructYard(self, yard = 'r', symbols = '' ):
-    colorSymbols = string.ascii_lowercase + '?'  #string.ascii_uppercase + 
-    amountSymbols = '*#'
-    stdColorSet = ''.join(self._colorSet)
-     # determine symbols in the yard
-    symbols = symbols.split(',')
-    _symbols = {}
-    _symbols['?'] = {'colors' : list('rgbw'), 'proces': '?'} # default random color symbol
-    _symbols['*'] = {'value' : 4, 'proces': '?'} # default random amount symbol
-    for symbol in symbols:
-      if len(symbol) > 1 and symbol[0] == '-':
-        try:
-          self._stack = int(symbol[1])
-        except:
-          continue
-
-      if len(symbol) < 3: continue
-
-      if symbol[0] in amountSymbols and symbol[2] in string.digits:
-        _symbols[symbol[0]] = {'value' : int(symbol[2]), 'proces': symbol[1]}
-
-      if symbol[0] in colorSymbols:
-        # get valid colorset
-        colorset = ''
-        for c in symbol[2:]:
-          if c in stdColorSet:
-            colorset += c
-        if colorset == '': colorset = stdColorSet
-        _symbols[symbol[0]] = {'value': False, 'colors' : list(colorset), 'proces': symbol[1], 'reset': list(colorset)}
-   
-    stacks = yard.split(',')
-
-    _yard = []
-    for stack in stacks:
-      _stack = []
-      amountBoxes = 1
-      color = False
-      for char in _symbols:
-        if _symbols[char]['proces'] == '|':
-          _symbols[char]['colors'] = _symbols[char]['reset'] + [] # every stack a new color set
-      for char in stack:
-        if char in colorSymbols:
-          for _ in range(amountBoxes):
-            if char in _symbols:
-              if _symbols[char]['proces'] == '?':
-                color = random.choice(_symbols[char]['colors'])
-              elif _symbols[char]['proces'] in ['-','|']:
-                color = random.choice(_symbols[char]['colors'])
-                _symbols[char]['colors'].remove(color)
-                if len(_symbols[char]['colors']) == 0:
-                  _symbols[char]['colors'].append('n')
-              elif _symbols[char]['proces'] == '>':
-                color = _symbols[char]['colors'][_symbols[char]['value']]
-                _symbols[char]['value'] = (_symbols[char]['value']+1) % len(_symbols[char]['colors'])
-              elif _symbols[char]['proces'] == '<':
-                color = _symbols[char]['colors'][_symbols[char]['value']]
-                _symbols[char]['value'] = (_symbols[char]['value']-1+len(_symbols[char]['colors'])) % len(_symbols[char]['colors'])
-              elif _symbols[char]['proces'] == '=':
-                if _symbols[char]['value'] == False:
-                  _symbols[char]['value'] = random.randint(0,len(_symbols[char]['colors'])-1)
-                color = _symbols[char]['colors'][_symbols[char]['value']]
-            elif char in stdColorSet:
-              color = char
-            else:
-              color = self._colorSet[-1] # pick deault last of colors
-            if len(_stack) < self._maxLayers:
-              _stack.append(color)
-          amountBoxes = 1
-        elif char in string.digits:
-          amountBoxes = int(char)
-        elif char in amountSymbols and char in _symbols:
-          if _symbols[char]['proces'] == '?':
-            if self._level == 3 and self._limitActions:
-              amountBoxes = _symbols[char]['value'] # test maximal!!
-            else:
-              amountBoxes = random.randint(0,_symbols[char]['value'])
-          else:
-            amountBoxes = _symbols[char]['value']
-            if _symbols[char]['proces'] == '+':
-              _symbols[char]['value'] += 1
-            if _symbols[char]['proces'] == '-':
-              _symbols[char]['value'] -= 1
-              if _symbols[char]['value'] < 0: 
-                _symbols[char]['value'] = 0
-      _yard.append(_stack)
-
-    while len(_yard) < self._maxStacks:
-      _yard.append([])
-    return _yard
-  
-  def setLevelLimits(self, level, levels):
-    _limitLines = False
-    _limitActions = False
-    if level in [1,2,3] and type(levels) is str and levels > '':
-      _levels = levels.split(',')
-      try:
-        for _level in _levels:
-          if level == int(_level[0]):
-            _limits =  _level.split(':')[1].split('/')
-            _limitLines = int(_limits[0])
-            if len(_limits) >= 2:
-              _limitActions = int(_limits[1])
-      except: pass
-    return _limitLines, _limitActions
-  
-  def setSolution(self, solution):
-    if type(solution) is str:
-      solution += (self._maxStacks - solution.count(',') - 1) * ','
-      _yardSolution = self.constructYard(solution,'')
-      solution = self.serializeYard(_yardSolution)
-    return solution
-  
-  def setScanLimits(self,scans):
-    _scansMax = False
-    _scansMin = False
-    if type(scans) is str:
-      _limits = scans.split(":")
-      try:
-        _scansMin = int(_limits[0])
-      except:
-        print('error specs scans minimum')
-      try:
-        _scansMax = int(_limits[1])
-      except:
-        print('error specs scans maximum')        
-    return _scansMin, _scansMax
-  
-  def _displayMission(self):
-    
-    if self._level == 0: return
-    info1 = 'No restrictions on lines of code'
-    info2 = 'No restrictions on actions taken, but no errors allowed.'
-    if self._level in [1,2,3] and self._limitLines != False:
-      info1 = f'Maximum number of lines of code: {self._limitLines}'
-    if self._scansMin:
-      info2 += f' {self._scansMin} to {self._scansMax} scans needed.'
-    if self._level in [3]:
-      info2 = f'Maximum number of actions: {self._limitActions}' if self._limitActions != False else 'No restrictions on actions taken'
-      if self._scansMax:
-        info2 += f', maximal {self._scansMax} scans allowed'      
-      info2 += ', no errors nor warnings!'
-
-    _missionText = 'WITH UNKNOWN SOLUTION' if self._solution == False else f'AT LEVEL: {self._level}'
-    self._missionInfo(f'STARTED {_missionText} ', info1, info2,'yellow')
-    self._log(f'Started with {self._lines} lines of code','i')
-
-  def load(self, challenge = _defaultChallenge , level = 0):
-    _symbols = ''
-    _solution = False
-    _levels = False
-    _scans = False
-    _criteria = False
-    _example = False
-    _info = ''
-
-    if type(challenge) is dict:
-      _yard = challenge.get('start','')
-      _symbols = challenge.get('symbols','')
-      _solution = challenge.get('solution',False)
-      _criteria = challenge.get('criteria',False)
-      _example = challenge.get('example',False)
-      _levels = challenge.get('levels',False)
-      _scans = challenge.get('scans',False)
-      _challengeName = challenge.get('name',f'no name')
-      _challengeName = _challengeName if _challengeName else 'no name'
-      _info = challenge.get('info','')
-    elif type(challenge) is str:
-      level = 0
-      _yard = challenge
-      _challengeName = f'no name' 
-    else:
-      return False
+  def load(self, challenge = _defaultChallenge , level = 0, seed = None):
+    return self._engine.load(challenge, level, seed)
 
-    if _levels != False:
-      while level > 1 and not str(level)+':' in _levels: level -= 1
-    self._level = level
-    
-    self._yard = self.constructYard(_yard, _symbols)
-    self._yardStart = self.serializeYard(self._yard)
-    self._solution = self.setSolution(_solution)
-    self._criteria = _criteria
-    self._example = _example
-    self._solutionDone = False
-
-    self._limitLines, self._limitActions = self.setLevelLimits(level, _levels)
-    self._scansMin, self._scansMax = self.setScanLimits(_scans)
-    self._lines = self._count_lines_of_code()
-    self._actions = 0
-    self._challengeName =_challengeName
-
-    msg = self._colored(self._challengeName,'blue') + ('\n'+_info if _info else '')
-    self._log(msg,'i')
-
-    self._mission = False
-    self._knownEmpty = [True for stack in range(self._maxStacks)]
-    self._accuCapacity = self._limitActions
-    self._accuEmpty = False
-    self._scans = 0
-    self._displayMission()
-    self._animate('idle')
+  def serializeYard(self, yard):
+    return self._engine.serializeYard(yard)
 
-    return True
+########### EXPORT ###########
 
-  def serializeYard(self, yard):
-    _yard = ''
-    for stack in yard:
-      _yard += ''.join(stack)+','
-    return _yard[:-1]
+  def startExport(self, path, fps = 25, hold = 1000):
+    # frames drawn from now on go to an animated gif (path ends with .gif) or a png sequence in directory path
+    from robotArmExport import FrameExport
+    self.stopExport()
+    self._export = FrameExport(path, fps, hold)
+    self._drawState()
+    self._update()
+
+  def stopExport(self):
+    # returns the number of frames written
+    if not self._export: return 0
+    export = self._export
+    self._export = None
+    return export.close(self._screen)
 
 ########### EVENT HANDLING ###########
 
@@ -805,6 +699,39 @@ class RobotArm:
           if self.speed > 0:
             self.speed -= 1
 
+  def _handleEvents(self):
+    # while animating: keys for the operator are queued, not lost
+    for event in pygame.event.get():
+      self.checkCloseEvent(event)
+      if not self._queueCommand(event):
+        self.handleSpeedEvent(event)
+
+  def _queueCommand(self, event):
+    if self._commands is None or event.type != pygame.KEYDOWN:
+      return False
+    if event.key in [pygame.K_SPACE, pygame.K_ESCAPE]:
+      self._stopEvents.append(event)
+      return True
+    if event.key not in self._commandKeys:
+      return False
+    if len(self._commands) < self._commandLimit:
+      self._commands.append(self._commandKeys[event.key])
+    return True
+
+  def _runCommand(self):
+    command = self._commands.popleft()
+    if command == 'down':
+      if self._engine._color == '':
+        self.grab()
+      else:
+        self.drop()
+      return
+    count = 1
+    while self._coalesceMoves and self._commands and self._commands[0] == command:
+      self._commands.popleft()
+      count += 1
+    self.execute([command] * count) # moves in a row glide
+
   def _defaultHandler(self, events):
     for event in events:
       self.checkCloseEvent(event)
@@ -815,116 +742,78 @@ class RobotArm:
         if event.key == pygame.K_SPACE:
           return False
         elif event.key == pygame.K_ESCAPE:
-          self._aborted = True
+          self._engine._aborted = True
           return False
     return True
 
+  def _nextEvents(self):
+    # blocks until an event arrives or the timeout passes, then takes all queued events
+    event = pygame.event.wait(self._eventTimeout)
+    if event.type == pygame.NOEVENT:
+      return []
+    return [event] + pygame.event.get()
+
   def _wait(self, handler = False):
+    if self.speed == self.TURBO:
+      self._turboFrame(True)
+    if self._offscreen: return # nobody to press a key
     print(f'Press spacebar to continue...')
-    cycle = 0
-    while True:
-      events = pygame.event.get()               # get latest events
-      if callable(handler):
-        if not handler(events):
-          break
-      self._defaultHandler(events)
-      if not self._continue(events):
-        return
-      if len(events) > 0:                       # events happened?
-        cycle = 0                               # stay awake and alert
-      cycle += 1                                # prepare for sleep
-
-      if cycle > self._eventActiveCycles:       # after 30 cycles
-        pygame.time.delay(self._eventSleepTime) # go asleep for 300 milliseconds, give the processor some rest
-        cycle = 0                               # wake up for events during sleep
+    pygame.event.set_blocked(None)              # only the events a wait handles are queued
+    pygame.event.set_allowed(self._waitEventTypes)
+    try:
+      while True:
+        events = self._nextEvents()             # sleeps without using the processor
+        if any(event.type == pygame.WINDOWEXPOSED for event in events):
+          pygame.display.update()               # window was covered: show it again
+        if callable(handler):
+          if not handler(events):
+            break
+        self._defaultHandler(events)
+        if not self._continue(events):
+          return
+    finally:
+      pygame.event.set_allowed(None)
 
   def _operator(self, instructions):
     for instruction in instructions:
-      if instruction.type == pygame.KEYDOWN:
-          if instruction.key == pygame.K_LEFT:
-            self.moveLeft()
-          if instruction.key == pygame.K_RIGHT:
-            self.moveRight()
-          if instruction.key == pygame.K_DOWN:
-            if self._color == '':
-              self.grab()
-            else:
-              self.drop()
+      if instruction.type == pygame.KEYDOWN and instruction.key in self._commandKeys: # spacebar and escape: the wait
+        self._queueCommand(instruction)
+    while self._commands and not self._stopEvents: # keys pressed during the actions are queued too
+      self._runCommand()
+    for event in self._stopEvents:              # handled by the wait
+      pygame.event.post(event)
+    self._stopEvents = []
+    if self.speed == self.TURBO and instructions:
+      self._turboFrame(True)
     return True # continue listening
 
   def operate(self):
-    self._reportMission()
-    self._wait(self._operator)
-
-  def _reportMission(self):
-    if self._level == 0 or self._missionReported : return
-    self._missionReported = True
-    if self._solution == False:
-      self._missionInfo(f'UNDECIDED', 'No solution defined', 'Try define a solution with levels','white')  
-    elif self._actions == 0:
-      self._missionInfo(f'NOT STARTED', 'Start thinking and coding', 'start at level 0','white')  
-    else:
-      fails = []
-      if self._criticals['e'] > 0:
-        fails.append('errors encountered')
-      if not self._solutionDone:
-        fails.append('solution not reached')
-      if self._level > 0 and self._limitLines != False and self._lines > self._limitLines:
-        fails.append('too many code lines')
-      if self._level > 2 and self._limitActions != False and self._actions > self._limitActions:
-        fails.append('too many actions')
-      if self._level > 2 and self._criticals['w'] > 0:
-        fails.append('warnings given')
-      if self._scansMin and self._scans < self._scansMin:
-        fails.append(f'less than {self._scansMin} scans')
-      if self._level > 2 and self._scansMax and self._scans > self._scansMax:
-        fails.append(f'more than {self._scansMax} scans')        
-      if fails:
-        sup = ' AND ABORTED' if self._aborted else ''
-        info1 = 'Mission not yet accomplished. Lets work on it!'
-        info2 = 'because: ' + ', '.join(fails)
-        self._missionInfo(f'FAILED'+sup, info1, info2,'red')
-      else:
-        info1 = 'Mission accomplished. Congrats!'
-        if self._level == 3:
-          info2 = 'Try another challenge!'
-        else:
-          info2 = 'Try a higher level!'
-        self._missionInfo(f'ACCOMPLISHED', info1, info2,'green')    
+    self._engine.operate()
+    repeat = pygame.key.get_repeat()
+    pygame.key.set_repeat(*self._keyRepeat)
+    self._commands = deque()
+    try:
+      self._wait(self._operator)
+    finally:
+      self._commands = None
+      pygame.key.set_repeat(*repeat)
       
   def report(self):
-    self._reportMission()
+    self._engine.report()
     self._wait()
   
   def wait(self):
     self._wait()
 
-  @staticmethod
   def help(self):
-    print(help)
+    self._engine.help()
   
   def helpChallenge(self):
-    print(helpChallenge)
-
-  def _reconstructYard(self,yard):
-    _yard = []
-    stacks = yard.split(',')
-    for stack in stacks:
-      _yard.append(list(stack))
-    return _yard
+    self._engine.helpChallenge()
 
   def showSolution(self):
-    if type(self._solution) == str:
-      _solution = self._solution
-    elif callable(self._example):
-      _yard = self.serializeYard(self._yard)
-      _solution = self._example(_yard,self._criteria)
-    else: return
-
-    self._yard = self._reconstructYard(_solution)
+    if not self._engine.showSolution(): return
     self._animate('idle')
-    print(self._colored('Solution example displayed','yellow'))
-    self._aborted = True
     self._wait()
 
 
@@ -0,0 +1,784 @@
+import os
+import sys
+import ast
+import io
+import random
+import inspect
+import tokenize
+from robotArmSolutions import compileSolution
+from robotArmYards import compileYard, Yard
+
+# RobotArmEngine class ##########################################
+# runs the robotarm logic without any display: yard, arm, accu and criticals
+# observers (like the pygame RobotArm) are notified with: observer.notify(engine, event, *args)
+#   events: 'load', 'left', 'right', 'down', 'up', 'hazard', 'solution', 'accuEmpty', 'wait'
+
+help = '''
+  =================== RobotArm ===================
+  moves boxes from one spot to another...
+  
+  robotArm = RobotArm(challenge,level)
+    loads a challenge and displays its stacks of colored boxes
+
+  robotArm = RobotArm(challenge,level,speed)
+    same, animating at speed 0..5, or without any animation at speed RobotArm.TURBO
+
+  robotArm = RobotArm(challenge,level,speed,seed)
+    same, with the random boxes of the challenge drawn from seed: the same seed gives the same start
+
+  robotArm = RobotArm(challenge,level,RobotArm.TURBO,turboFrameActions=100)
+    without animations, but showing the yard every 100 actions, default: only when waiting and at the end
+  
+  methods to use with robotArm:
+
+  moveRight()
+    moves the robotarm one stack position to the right
+    returns True if succeeded, returns False if not possible
+
+  moveLeft()
+    moves the robotarm one stack position to the left
+    returns True if succeeded, returns False if not possible
+
+  grab()
+    lets the robotarm grab a box from the stack if there is one
+    returns True if succeeded, returns False if not possible
+
+  drop()
+    lets the robotarm drop its box to the stack if not full
+    returns True if succeeded, returns False if not possible
+
+  scan()
+    returns the color of the box at the robotarm
+
+  execute('RRGLLD')
+    does the actions one after another: R moveRight, L moveLeft, G grab, D drop, S scan,
+    also as a list like ['moveRight', 'grab']; moves in a row animate as one move
+    returns a list of what every action returned
+    execute('RRGLLD', True) does no action at all if one of them would fail
+
+  stackEmpty()
+    returns True if stack under robotarm ie empty, else False
+
+  stackIndex() 
+    returns the current index (position) of the robotArm
+
+  showSolution()
+    displays the the solution (if available)
+
+  report()
+    reports the results of the mission (challenge and level) and then waits
+  
+  wait()
+    waits for the program window to continue 
+
+  operate()
+    makes the robotarm operate on keyboard-keys: LEFT, RIGHT and DOWN
+
+  help()
+    shows help in the terminal
+  
+  helpChallenge()
+    shows help in the terminal in creating challenges
+'''
+
+helpChallenge = '''
+=================== define challenges ===================
+
+  challenge example: 
+  {'name': 'collect boxes', 
+   'start' : 'gbg,,y,,br,,,,' , # defining the colors of boxes at spots separated by komma
+   'solution': ',,,,,,,,,gbgybr', # defining the colors of boxes at spots separated by komma
+   'levels':'2:20,3:20/29', # defining for levels: maximum code lines / maximum actions taken
+   'info': 'move all boxes to last spot' # detailed instructions to reach solution
+  }
+    
+    'start' defines the colors of boxes at spots separated by komma
+    'solution' defines the colors of boxes at spots separated by komma
+    'levels' defines for levels the levelnr: maximum code lines / maximum actions taken
+    'info' detailed instructions to reach solution
+    'stacks' number of spots, default 10; more than 20 spots scroll with the arm, with a minimap below
+    'layers' maximum boxes on a spot, default 8, at most 255; more than 12 scroll as well
+
+    supported colors: 
+    w=white, g=green, r=red, b=blue, y=yellow, o=orange, p=purple, l=grey, n=black, t=transparent and i=invisible
+
+    examples of start stacks and solution stacks:
+
+      3y2r  -> 3 yellow boxes, 2 red boxes
+      *b    -> random number (0..5) of blue boxes
+      4?    -> 4 boxes of a random color from: red, green, blue or white
+      *p combined with 'symbols' : '*?2' -> random number (0..2) of purple boxes
+      x combined with 'symbols' : 'x?yyyybb' -> 1 box with a color random picked from collection yyyybb
+      4x combined with 'symbols' : 'x-rrrrggg' -> 4 boxes with a color once random picked from collection rrrrggg
+      #w#r#b combined with 'symbols' : '#+1' -> 1 white, 2 red, 3 blue boxes
+      #w,#r,#b combined with 'symbols' : '#-5' -> in subsequent stacks: 5 white, 4 red, 3 blue boxes
+
+    solutions based on a start with random colors or numbers can be defined by a function called with criteria:
+    'criteria' : 'r:6' -> all red boxes to be collected at spot 6
+    'criteria' : 'b>2' -> all blue boxes to be moved 2 positions to the right
+    'criteria' : 'w<1' -> all white boxes to be moved 1 position to the left
+    'criteria' : '2}4' -> all boxes on spot to be distributed to the right starting at spot 4
+    'criteria' : '3{8' -> all boxes on spot to be distributed to the left starting at spot 8
+'''
+
+_linesOfCode = {} # path -> (modification time, lines of code), one entry per file
+
+def _skippedLines(tree):
+  # lines of docstrings and of print(...) and input(...) statements are not counted as code
+  skipped = set()
+  for node in ast.walk(tree):
+    if not isinstance(node, ast.Expr): continue
+    value = node.value
+    if isinstance(value, ast.Constant) and isinstance(value.value, str):
+      skipped.update(range(node.lineno, node.end_lineno + 1))
+    elif isinstance(value, ast.Call) and isinstance(value.func, ast.Name) and value.func.id in ['print','input']:
+      skipped.update(range(node.lineno, node.end_lineno + 1))
+  return skipped
+
+def countLinesOfCode(source):
+  # counts the lines with code, leaving out blank lines, comments, docstrings, print(...) and input(...)
+  try:
+    tree = ast.parse(source)
+    codeLines = set()
+    for token in tokenize.generate_tokens(io.StringIO(source).readline):
+      if token.type in [tokenize.COMMENT, tokenize.NL, tokenize.NEWLINE, tokenize.INDENT, tokenize.DEDENT, tokenize.ENDMARKER]: continue
+      codeLines.update(range(token.start[0], token.end[0] + 1))
+  except (SyntaxError, tokenize.TokenError, ValueError):
+    num_lines = 0
+    for line in source.splitlines():
+      line = line.strip()
+      if line and not line.startswith("#") and not line.startswith("print(") and not line.startswith("input("):
+        num_lines += 1
+    return num_lines
+  return len(codeLines - _skippedLines(tree))
+
+def countFileLinesOfCode(path):
+  try:
+    path = os.path.realpath(path)
+    modified = os.stat(path).st_mtime_ns
+  except OSError:
+    return 0
+  if _linesOfCode.get(path, (None,))[0] != modified:
+    with open(path, 'r') as f:
+      _linesOfCode[path] = (modified, countLinesOfCode(f.read()))
+  return _linesOfCode[path][1]
+
+class RobotArmEngine:
+  version = '2.6'
+  _colors = [
+    {"name": 'w', 'des': 'white'},
+    {"name": 'r', 'des': 'red'},
+    {"name": 'g', 'des': 'green'},
+    {"name": 'b', 'des': 'blue'},
+    {"name": 'y', 'des': 'yellow'},
+    {"name": 'p', 'des': 'purple'},
+    {"name": 'o', 'des': 'orange'},
+    {"name": 'n', 'des': 'black'},
+    {"name": 'i', 'des': 'invisible'}, # turns into transparent when grabbed
+    {"name": 't', 'des': 'transparent'},
+    {"name": 'l', 'des': 'gray'},
+  ]
+  _colorSet = [color['name'] for color in _colors]
+  _colorDescriptions = {color['name']: color['des'] for color in _colors}
+  _defaultChallenge = {'name': 'demo','start' : ',r','solution': 'r', 'levels': '1:10,2:10/6'}
+  EMPTY = ''
+
+  _maxStacks = 10
+  _maxLayers = 8
+  _actions = 0 # amount of actions done
+  _previousAction = ''
+  _accuCapacity = False
+  _solutionDone = False
+  _missionReported = False
+  _aborted = False
+  _actionFlaws = [
+    ['left','right'],
+    ['right','left'],
+    ['drop','grab'],
+    ['grab','drop'],
+    ['scan','scan'],
+    ['drop','scan'],
+  ]
+  _knownEmpty = []
+  _batchActions = {'R': 'right', 'L': 'left', 'G': 'grab', 'D': 'drop', 'S': 'scan',
+                   'right': 'right', 'left': 'left', 'grab': 'grab', 'drop': 'drop', 'scan': 'scan',
+                   'moveRight': 'right', 'moveLeft': 'left'}
+  _codeFile = False # file with the code of the robotarm program, False: the file that started python
+  _codeSource = False # code of the robotarm program, overrules _codeFile
+  _random = random # random source of constructYard, the random module when not seeded
+  _yardCache = {} # (start, symbols, seed, dims, level): (yard, stack) of seeded loads
+  _yardCacheSize = 256
+
+  def __init__(self, challenge = _defaultChallenge, level = 0, codeFile = False, codeSource = False, seed = None):
+    self._codeFile = codeFile
+    self._codeSource = codeSource
+    self.loadDims(challenge)
+    self._color = self.EMPTY
+    self._stack = 0
+    self._yard = Yard()
+    self._criticals = {'e':0,'w':0,'i':0}
+    self._observers = []
+    if challenge is not None:
+      self.load(challenge, level, seed)
+
+  def addObserver(self, observer):
+    if observer not in self._observers:
+      self._observers.append(observer)
+
+  def removeObserver(self, observer):
+    if observer in self._observers:
+      self._observers.remove(observer)
+
+  def _notify(self, event, *args):
+    for observer in self._observers:
+      observer.notify(self, event, *args)
+
+  def _count_lines_of_code(self):
+    if self._codeSource:
+      return countLinesOfCode(self._codeSource)
+    if self._codeFile:
+      return countFileLinesOfCode(self._codeFile)
+    main = sys.modules.get('__main__')
+    caller_filename = getattr(main, '__file__', None)
+    if not caller_filename:
+      current_frame = inspect.currentframe()
+      while current_frame.f_back:
+          current_frame = current_frame.f_back
+      caller_filename = inspect.getframeinfo(current_frame).filename
+    return countFileLinesOfCode(caller_filename)
+
+  def _colored(self,text,color):
+    if color == 'red':
+      return "\033[1;31;40m" + text + "\033[0m"
+    elif color == 'green':
+      return "\033[1;32;40m" + text + "\033[0m"
+    elif color == 'blue':
+      return "\033[1;34;40m" + text + "\033[0m"
+    elif color == "yellow":
+      return "\033[1;33;40m" + text + "\033[0m"
+    elif color == "orange":
+      return "\033[1;38;2;255;165;0m" + text + "\033[0m"
+    else:
+      return text
+
+  def _missionInfo(self, state, info1, info2 = '', color='white'):
+
+    def formatLine(text, paddingLeft, length, char, color='white'):
+      before = paddingLeft * char 
+      after = (length - len(text)) * char
+      return '*' + before + self._colored(text,color) + after + '*'
+    
+    length = max(len(info1),len(info2))
+    padding = 5
+    totalLength = length + 2 * padding
+    title = ' MISSION ' + state + ' '
+    top = formatLine(title ,padding, totalLength, '*',color) 
+    bottom = formatLine('',padding, totalLength, '*')
+    space = formatLine('',padding, totalLength, ' ')
+    info1 = formatLine(info1,padding, totalLength, ' ')
+    if info2: info2 = formatLine(info2,padding, totalLength, ' ')
+    print(top)
+    print(space)
+    print(info1)
+    if info2: print(info2)
+    print(space)
+    print(bottom)
+
+  def loadDims(self,challenge):
+    if not type(challenge) is dict: return
+    self._maxLayers = challenge.get('layers',self._maxLayers)
+    self._maxStacks = challenge.get('stacks',self._maxStacks)
+
+  def _getColorDes(self,name):
+    return self._colorDescriptions.get(name, '')
+
+  def _handleHazard(self, message = 'problem!'):
+    self._notify('hazard', message)
+    self._log(message,'e')
+
+  def _log(self, message, cat):
+    if self._level in [0] and cat == 'e': return
+    if self._level in [0,1,2] and cat == 'w': return
+    markup = {'w':{'title':'warning','color':'orange'},'i':{'title':'info   ','color':'white'},'e': {'title':'error  ','color':'red'}}
+    title = self._colored(markup[cat]['title'],markup[cat]['color'])
+    print(f'{title}: {message}')
+    self._criticals[cat] += 1
+
+  def _hasActionsLeft(self):
+    return self._accuCapacity == False or (self._accuCapacity - self._actions) > 0
+
+  def _checkAccu(self):
+    if not self._hasActionsLeft():
+      if self._accuEmpty:
+        self._notify('wait')
+      if self._accuEmpty == False: 
+        self._log('accu empty, use spacebar to proceed, escape to abort','w')
+        self._accuEmpty = True
+        self._notify('accuEmpty')
+      self._log('action, but accu empty','w')
+    self._actions += 1
+
+  def _checkFlaws(self, action):
+    for flaw in self._actionFlaws:
+      if (self._previousAction == flaw[0] and action == flaw[1]):
+        flawText = f'{flaw[1]} after {flaw[0]}'
+        self._log(f'action pointless: {flawText}?','w')
+    self._previousAction = action
+    if self._solutionDone and self._scans > self._scansMax:
+      self._log(f'needless action after solution','w')
+
+  ########### ROBOTARM MANIPULATION ###########
+  def moveRight(self):
+    if self._aborted: return
+    self._checkAccu()
+    self._checkFlaws('right')
+    success = False
+    if self._stack < self._maxStacks - 1:
+      self._notify('right')
+      self._stack += 1
+      success = True
+    else:
+      self._handleHazard('hit right border!')
+    self._notify('action', 'right', success)
+    return success
+
+  def moveLeft(self):
+    if self._aborted: return
+    self._checkAccu()
+    self._checkFlaws('left')
+    success = False
+    if self._stack > 0:
+      self._notify('left')
+      self._stack -= 1
+      success = True
+    else:
+      self._handleHazard('hit left border!')
+    self._notify('action', 'left', success)
+    return success
+
+  def grab(self):
+    if self._aborted: return
+    self._checkAccu()
+    self._checkFlaws('grab')
+    success = False
+    if self._color == self.EMPTY:
+      self._notify('down')
+      if self._yard.height(self._stack) > 0:
+        self._color = self._yard.pop(self._stack)
+        if self._color == 'i':
+          self._color = 't'
+        self._stackChanged(self._stack)
+        success = True
+      else:
+        if self._knownEmpty[self._stack]:
+          self._handleHazard('nothing to grab!')
+        else:
+          self._knownEmpty[self._stack] = True
+      self._notify('up')
+    else:
+      self._handleHazard('robot arm occupied!')
+    self._notify('action', 'grab', success)
+    return success
+
+  def drop(self):
+    if self._aborted: return
+    self._checkAccu()
+    self._checkFlaws('drop')
+    success = False
+    if self._color != self.EMPTY:
+      if self._yard.height(self._stack) < self._maxLayers:
+        self._notify('down')
+        self._yard.push(self._stack, self._color)
+        self._stackChanged(self._stack)
+        self._color = self.EMPTY
+        self._notify('up')
+        success = True
+      else:
+        self._handleHazard('stack full!')
+    else:
+      self._handleHazard('no box to drop!')
+    self._watchSolution()
+    self._notify('action', 'drop', success)
+    return success
+
+  def scan(self):
+    if self._aborted: return
+    self._checkAccu()
+    self._checkFlaws('scan')
+    self._scans += 1
+    self._notify('action', 'scan', True, self._color)
+    return self._getColorDes(self._color)
+  
+  def stackEmpty(self):
+    return self._yard.height(self._stack) == 0
+  
+  def stackIndex(self):
+    return self._stack
+
+  ########### BATCHES OF ACTIONS ###########
+  def parseActions(self, actions):
+    # 'RRGLLD' or an iterable of names like 'right' or 'moveRight' into action names
+    parsed = []
+    for index, action in enumerate(actions):
+      if isinstance(action, str) and action.isspace(): continue
+      if action not in self._batchActions:
+        raise ValueError(f'action {index}: unknown action {action!r}, use R, L, G, D, S or right, left, grab, drop, scan')
+      parsed.append(self._batchActions[action])
+    return parsed
+
+  def checkActions(self, actions):
+    # simulates action names from the current state: per action True if it succeeds,
+    # False if it fails without a hazard (first grab from an unknown empty stack), else the hazard
+    stack = self._stack
+    held = self._color
+    heights = [self._yard.height(index) for index in range(len(self._yard))]
+    knownEmpty = list(self._knownEmpty)
+    results = []
+    for action in actions:
+      result = True
+      if action == 'right':
+        if stack < self._maxStacks - 1:
+          stack += 1
+        else:
+          result = 'hit right border!'
+      elif action == 'left':
+        if stack > 0:
+          stack -= 1
+        else:
+          result = 'hit left border!'
+      elif action == 'grab':
+        if held != self.EMPTY:
+          result = 'robot arm occupied!'
+        elif heights[stack] > 0:
+          heights[stack] -= 1
+          held = 'box'
+        elif knownEmpty[stack]:
+          result = 'nothing to grab!'
+        else:
+          knownEmpty[stack] = True
+          result = False
+      elif action == 'drop':
+        if held == self.EMPTY:
+          result = 'no box to drop!'
+        elif heights[stack] >= self._maxLayers:
+          result = 'stack full!'
+        else:
+          heights[stack] += 1
+          held = self.EMPTY
+      results.append(result)
+    return results
+
+  def execute(self, actions, strict = False):
+    # the actions one by one, with the accounting of single calls; moves in a row that all
+    # succeed are announced to observers as one, to animate them in one pass
+    actions = self.parseActions(actions)
+    checks = self.checkActions(actions)
+    if strict:
+      hazards = [f'{index} {actions[index]}: {check}' for index, check in enumerate(checks) if type(check) is str]
+      if hazards:
+        raise ValueError('actions would fail: ' + ', '.join(hazards))
+    methods = {'right': self.moveRight, 'left': self.moveLeft, 'grab': self.grab, 'drop': self.drop, 'scan': self.scan}
+    results = []
+    index = 0
+    while index < len(actions):
+      action = actions[index]
+      count = 1
+      while action in ['left','right'] and index + count < len(actions) and actions[index + count] == action and checks[index + count] is True:
+        count += 1
+      if count > 1 and checks[index] is True:
+        self._notify('moves', count)
+      for _ in range(count):
+        results.append(methods[action]())
+      if count > 1:
+        self._notify('moves', 0)
+      index += count
+    return results
+
+########### LEVEL & YARD lOADING & CREATION ###########
+
+  def _watchYard(self):
+    # keeps the serialized stacks and, for a fixed solution, the number of stacks that differ from it
+    self._stackStrings = list(self._yard)
+    self._yardChanged = True
+    self._mismatches = 0
+    self._compiledSolution = None
+    if callable(self._solution):
+      self._compiledSolution = compileSolution(self._solution, self._yardStart, self._criteria)
+    if self._compiledSolution:
+      self._failingStacks = self._compiledSolution.failing(self._stackStrings)
+      if len(self._stackStrings) != self._compiledSolution.length:
+        self._failingStacks.add(-1) # never solved with a different number of stacks
+    elif type(self._solution) is str:
+      self._solutionStacks = self._solution.split(',')
+      self._mismatches = abs(len(self._solutionStacks) - len(self._stackStrings)) # never equal with a different number of stacks
+      for stack in range(min(len(self._solutionStacks), len(self._stackStrings))):
+        if self._stackStrings[stack] != self._solutionStacks[stack]:
+          self._mismatches += 1
+
+  def _stackChanged(self, stack):
+    before = self._stackStrings[stack]
+    after = self._yard[stack]
+    self._stackStrings[stack] = after
+    self._yardChanged = True
+    if type(self._solution) is str and stack < len(self._solutionStacks):
+      target = self._solutionStacks[stack]
+      self._mismatches += (after != target) - (before != target)
+    elif self._compiledSolution and stack in self._compiledSolution.indices:
+      if self._compiledSolution.stackOk(stack, after):
+        self._failingStacks.discard(stack)
+      else:
+        self._failingStacks.add(stack)
+
+  def _isSolution(self):
+    if type(self._solution) is str:
+      return self._mismatches == 0
+    elif self._compiledSolution:
+      return not self._failingStacks
+    elif callable(self._solution):
+      if self._yardChanged:
+        self._yardChanged = False
+        self._solutionFound = self._solution(self._yardStart, ','.join(self._stackStrings), self._criteria)
+      return self._solutionFound
+    
+  def _watchSolution(self):
+    if self._isSolution():
+      self._solutionDone = True
+      self._notify('solution')
+      
+  def constructYard(self, yard = 'r', symbols = '' ):
+    compiled = compileYard(yard, symbols, ''.join(self._colorSet), self._maxStacks, self._maxLayers)
+    if compiled.stack is not None:
+      self._stack = compiled.stack
+    return compiled.construct(self._random, self._level == 3 and bool(self._limitActions)) # test maximal!!
+  
+  def setLevelLimits(self, level, levels):
+    _limitLines = False
+    _limitActions = False
+    if level in [1,2,3] and type(levels) is str and levels > '':
+      _levels = levels.split(',')
+      try:
+        for _level in _levels:
+          if level == int(_level[0]):
+            _limits =  _level.split(':')[1].split('/')
+            _limitLines = int(_limits[0])
+            if len(_limits) >= 2:
+              _limitActions = int(_limits[1])
+      except: pass
+    return _limitLines, _limitActions
+  
+  def setSolution(self, solution):
+    if type(solution) is str:
+      solution += (self._maxStacks - solution.count(',') - 1) * ','
+      _yardSolution = self.constructYard(solution,'')
+      solution = self.serializeYard(_yardSolution)
+    return solution
+  
+  def setScanLimits(self,scans):
+    _scansMax = False
+    _scansMin = False
+    if type(scans) is str:
+      _limits = scans.split(":")
+      try:
+        _scansMin = int(_limits[0])
+      except:
+        print('error specs scans minimum')
+      try:
+        _scansMax = int(_limits[1])
+      except:
+        print('error specs scans maximum')        
+    return _scansMin, _scansMax
+  
+  def _displayMission(self):
+    
+    if self._level == 0: return
+    info1 = 'No restrictions on lines of code'
+    info2 = 'No restrictions on actions taken, but no errors allowed.'
+    if self._level in [1,2,3] and self._limitLines != False:
+      info1 = f'Maximum number of lines of code: {self._limitLines}'
+    if self._scansMin:
+      info2 += f' {self._scansMin} to {self._scansMax} scans needed.'
+    if self._level in [3]:
+      info2 = f'Maximum number of actions: {self._limitActions}' if self._limitActions != False else 'No restrictions on actions taken'
+      if self._scansMax:
+        info2 += f', maximal {self._scansMax} scans allowed'      
+      info2 += ', no errors nor warnings!'
+
+    _missionText = 'WITH UNKNOWN SOLUTION' if self._solution == False else f'AT LEVEL: {self._level}'
+    self._missionInfo(f'STARTED {_missionText} ', info1, info2,'yellow')
+    self._log(f'Started with {self._lines} lines of code','i')
+
+  def _setRandom(self, seed):
+    # seed: None for the random module, a number, or a random.Random to draw from
+    self._seed = seed
+    if seed is None:
+      self._random = random
+    elif isinstance(seed, random.Random):
+      self._random = seed
+    else:
+      self._random = random.Random(seed)
+
+  def _constructStart(self, yard, symbols):
+    # a seeded start is constructed once per dims and level, later loads reuse it
+    if self._seed is None or isinstance(self._seed, random.Random):
+      return Yard.fromStacks(self.constructYard(yard, symbols), self._maxLayers)
+    key = (yard, symbols, self._seed, self._maxStacks, self._maxLayers, self._level, bool(self._limitActions))
+    if key not in self._yardCache:
+      stack = self._stack
+      self._stack = None
+      _yard = self.constructYard(yard, symbols)
+      if len(self._yardCache) >= self._yardCacheSize:
+        del self._yardCache[next(iter(self._yardCache))]
+      self._yardCache[key] = (Yard.fromStacks(_yard, self._maxLayers), self._stack)
+      self._stack = stack
+    _yard, stack = self._yardCache[key]
+    if stack is not None:
+      self._stack = stack
+    return _yard.copy()
+
+  def load(self, challenge = _defaultChallenge , level = 0, seed = None):
+    _symbols = ''
+    _solution = False
+    _levels = False
+    _scans = False
+    _criteria = False
+    _example = False
+    _info = ''
+
+    if type(challenge) is dict:
+      _yard = challenge.get('start','')
+      _symbols = challenge.get('symbols','')
+      _solution = challenge.get('solution',False)
+      _criteria = challenge.get('criteria',False)
+      _example = challenge.get('example',False)
+      _levels = challenge.get('levels',False)
+      _scans = challenge.get('scans',False)
+      _challengeName = challenge.get('name',f'no name')
+      _challengeName = _challengeName if _challengeName else 'no name'
+      _info = challenge.get('info','')
+    elif type(challenge) is str:
+      level = 0
+      _yard = challenge
+      _challengeName = f'no name' 
+    else:
+      return False
+
+    if _levels != False:
+      while level > 1 and not str(level)+':' in _levels: level -= 1
+    self._level = level
+    self._limitLines, self._limitActions = self.setLevelLimits(level, _levels) # constructYard uses _limitActions
+    
+    self._setRandom(seed)
+    self._yard = self._constructStart(_yard, _symbols)
+    self._yardStart = self.serializeYard(self._yard)
+    self._solution = self.setSolution(_solution)
+    self._criteria = _criteria
+    self._example = _example
+    self._solutionDone = False
+    self._watchYard()
+
+    self._scansMin, self._scansMax = self.setScanLimits(_scans)
+    self._lines = self._count_lines_of_code()
+    self._actions = 0
+    self._challengeName =_challengeName
+
+    msg = self._colored(self._challengeName,'blue') + ('\n'+_info if _info else '')
+    self._log(msg,'i')
+
+    self._mission = False
+    self._knownEmpty = [True for stack in range(self._maxStacks)]
+    self._accuCapacity = self._limitActions
+    self._accuEmpty = False
+    self._scans = 0
+    self._displayMission()
+    self._notify('load')
+
+    return True
+
+  def serializeYard(self, yard):
+    if isinstance(yard, Yard):
+      return yard.serialize()
+    return ','.join([''.join(stack) for stack in yard])
+
+  def missionResult(self):
+    # returns the state of the mission and the reasons why it failed
+    if self._solution == False:
+      return 'UNDECIDED', []
+    if self._actions == 0:
+      return 'NOT STARTED', []
+    fails = []
+    if self._criticals['e'] > 0:
+      fails.append('errors encountered')
+    if not self._solutionDone:
+      fails.append('solution not reached')
+    if self._level > 0 and self._limitLines != False and self._lines > self._limitLines:
+      fails.append('too many code lines')
+    if self._level > 2 and self._limitActions != False and self._actions > self._limitActions:
+      fails.append('too many actions')
+    if self._level > 2 and self._criticals['w'] > 0:
+      fails.append('warnings given')
+    if self._scansMin and self._scans < self._scansMin:
+      fails.append(f'less than {self._scansMin} scans')
+    if self._level > 2 and self._scansMax and self._scans > self._scansMax:
+      fails.append(f'more than {self._scansMax} scans')        
+    return ('FAILED' if fails else 'ACCOMPLISHED'), fails
+
+  def _reportMission(self):
+    if self._level == 0 or self._missionReported : return
+    self._missionReported = True
+    state, fails = self.missionResult()
+    if state == 'UNDECIDED':
+      self._missionInfo(f'UNDECIDED', 'No solution defined', 'Try define a solution with levels','white')  
+    elif state == 'NOT STARTED':
+      self._missionInfo(f'NOT STARTED', 'Start thinking and coding', 'start at level 0','white')  
+    elif fails:
+      sup = ' AND ABORTED' if self._aborted else ''
+      info1 = 'Mission not yet accomplished. Lets work on it!'
+      info2 = 'because: ' + ', '.join(fails)
+      self._missionInfo(f'FAILED'+sup, info1, info2,'red')
+    else:
+      info1 = 'Mission accomplished. Congrats!'
+      if self._level == 3:
+        info2 = 'Try another challenge!'
+      else:
+        info2 = 'Try a higher level!'
+      self._missionInfo(f'ACCOMPLISHED', info1, info2,'green')    
+      
+  def report(self):
+    self._reportMission()
+
+  def operate(self):
+    self._reportMission()
+  
+  def wait(self):
+    pass
+
+  def help(self):
+    print(help)
+  
+  def helpChallenge(self):
+    print(helpChallenge)
+
+  def _reconstructYard(self,yard):
+    _yard = []
+    stacks = yard.split(',')
+    for stack in stacks:
+      _yard.append(list(stack))
+    return _yard
+
+  def showSolution(self):
+    if type(self._solution) == str:
+      _solution = self._solution
+    elif callable(self._example):
+      _yard = self.serializeYard(self._yard)
+      _solution = self._example(_yard,self._criteria)
+    else: return False
+
+    self._yard = Yard.fromStacks(self._reconstructYard(_solution), self._maxLayers)
+    self._watchYard()
+    print(self._colored('Solution example displayed','yellow'))
+    self._aborted = True
+    return True
+
+
+if __name__ == "__main__":
+  print('tested module RobotArmEngine')
@@ -10,7 +10,9 @@ import pygame
 class SpriteSheet(object):
   def __init__(self, filename):
     try:
-      self.sheet = pygame.image.load(filename).convert()
+      self.sheet = pygame.image.load(filename)
+      if pygame.display.get_surface(): # convert needs a window, not there when drawing offscreen
+        self.sheet = self.sheet.convert()
     except pygame.error:
       print ('Unable to load spritesheet image:', filename, pygame.error)
       raise SystemExit
@@ -18,7 +20,9 @@ class SpriteSheet(object):
   def image_at(self, rectangle, colorkey = None):
     "Loads image from x,y,x+offset,y+offset"
     rect = pygame.Rect(rectangle)
-    image = pygame.Surface(rect.size).convert()
+    image = pygame.Surface(rect.size)
+    if pygame.display.get_surface():
+      image = image.convert()
     image.blit(self.sheet, (0, 0), rect)
     if colorkey is not None:
       if colorkey == -1:
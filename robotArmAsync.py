@@ -0,0 +1,189 @@
+import asyncio
+from collections import deque
+import pygame
+from RobotArm import RobotArm, ShownState
+from RobotArmEngine import RobotArmEngine
+
+helpAsync = '''
+=================== robotarm for asyncio ===================
+
+  robotArm = AsyncRobotArm(challenge, level, speed, seed)
+    a robotarm drawn offscreen, robotArm.surface holds the last frame
+  robotArm = AsyncRobotArm(challenge, level, speed, seed, window = True)
+    drawn in a window, for one robotarm per program
+
+  await robotArm.move_right()     also moveRight(), like all methods below
+  await robotArm.move_left()
+  await robotArm.grab()
+  await robotArm.drop()
+  await robotArm.scan()
+  await robotArm.execute('RRGLLD')
+  await robotArm.report()
+  await robotArm.wait()
+  robotArm.stack_empty()
+  robotArm.stack_index()
+
+  the actions are done by the engine at once, with the same accounting as RobotArm;
+  the animation is played before the await returns, yielding to the event loop
+  between frames instead of sleeping, so any number of robotarms run concurrently:
+
+    await asyncio.gather(*(solve(AsyncRobotArm(challenge)) for challenge in challenges))
+
+  robotArm.onFrame = function(surface)   called after every frame drawn
+  AsyncRobotArm.renderFps = 30            frames per second, default 60
+'''
+
+class AsyncRobotArm(RobotArm):
+  renderFps = 60
+
+  def __init__(self, challenge = RobotArm._defaultChallenge, level = 0, speed = 1, seed = None, window = False):
+    self._offscreen = not window
+    self._logic = RobotArmEngine(None) # the engine of the program; _engine is the state shown
+    self._logic.loadDims(challenge)
+    self._engine = ShownState(self._logic)
+    self._initView(speed)
+    self._animations = deque()
+    self.onFrame = None
+
+    pygame.init()
+    self._setScreen()
+    if window:
+      pygame.display.set_icon(self._getIcon())
+
+    self._logic.addObserver(self)
+    self._logic.load(challenge, level, seed)
+    self._engine = ShownState(self._logic)
+    self._drawState()
+
+  @property
+  def surface(self):
+    return self._screen
+
+  def notify(self, engine, event, *args):
+    # during an action of the engine: queue the animation, played when the action is awaited
+    args = self._queuedGlide(engine, event, args)
+    if args is None: return
+    if event in ['left','right','down','up','load','hazard','solution','accuEmpty','wait']:
+      self._animations.append((event, args, ShownState(self._logic)))
+
+  async def _frame(self):
+    self._update()
+    if self.onFrame:
+      self.onFrame(self._screen)
+    if not self._offscreen:
+      self._handleEvents()
+    await asyncio.sleep(1 / self.renderFps)
+
+  async def _play(self):
+    loop = asyncio.get_running_loop()
+    while self._animations:
+      event, args, shown = self._animations.popleft()
+      self._engine = shown
+      if event == 'wait':
+        await self._waitKeys()
+        continue
+      self._startAnimation(event, args)
+      duration = self._animationDuration(event)
+      started = loop.time()
+      while loop.time() - started < duration:
+        self._drawAnimation(event, args, loop.time() - started)
+        await self._frame()
+      self._endAnimation(event)
+    self._drawState()
+    self._update()
+
+  async def _act(self, method, *args):
+    result = method(*args)
+    await self._play()
+    return result
+
+  async def _waitKeys(self):
+    # spacebar continues, escape aborts; offscreen nobody presses a key
+    if self._offscreen: return
+    self._drawState()
+    while True:
+      for event in pygame.event.get():
+        self.checkCloseEvent(event)
+        if event.type == pygame.KEYDOWN and event.key in [pygame.K_SPACE, pygame.K_ESCAPE]:
+          if event.key == pygame.K_ESCAPE:
+            self._logic._aborted = True
+          return
+      await self._frame()
+
+  async def move_right(self):
+    return await self._act(self._logic.moveRight)
+
+  async def move_left(self):
+    return await self._act(self._logic.moveLeft)
+
+  async def grab(self):
+    return await self._act(self._logic.grab)
+
+  async def drop(self):
+    return await self._act(self._logic.drop)
+
+  async def scan(self):
+    return await self._act(self._logic.scan)
+
+  async def execute(self, actions, strict = False):
+    return await self._act(self._logic.execute, actions, strict)
+
+  async def report(self):
+    await self._play()
+    self._logic.report()
+    await self._waitKeys()
+
+  async def wait(self):
+    await self._play()
+    await self._waitKeys()
+
+  async def load(self, challenge = RobotArm._defaultChallenge, level = 0, seed = None):
+    return await self._act(self._logic.load, challenge, level, seed)
+
+  async def showSolution(self):
+    if not self._logic.showSolution(): return
+    self._animations.append(('load', (), ShownState(self._logic)))
+    await self.wait()
+
+  async def operate(self):
+    await self._play()
+    self._logic.operate()
+    if self._offscreen: return
+    while True:
+      for event in pygame.event.get():
+        self.checkCloseEvent(event)
+        if event.type != pygame.KEYDOWN: continue
+        if event.key in [pygame.K_SPACE, pygame.K_ESCAPE]:
+          if event.key == pygame.K_ESCAPE:
+            self._logic._aborted = True
+          return
+        command = self._commandKeys.get(event.key)
+        if command == 'down':
+          command = 'grab' if self._logic._color == self.EMPTY else 'drop'
+        if command:
+          await self._act(self._logic.execute, [command])
+      await self._frame()
+
+  def stack_empty(self):
+    return self._logic.stackEmpty()
+
+  def stack_index(self):
+    return self._logic.stackIndex()
+
+  def serializeYard(self, yard):
+    return self._logic.serializeYard(yard)
+
+  def help(self):
+    self._logic.help()
+
+  def helpChallenge(self):
+    self._logic.helpChallenge()
+
+  moveRight = move_right
+  moveLeft = move_left
+  stackEmpty = stack_empty
+  stackIndex = stack_index
+  show_solution = showSolution
+
+if __name__ == "__main__":
+  print(helpAsync)
@@ -0,0 +1,135 @@
+import os
+import math
+import time
+import argparse
+import statistics
+import multiprocessing
+from robotArmSolver import SolverLimit, allChallenges, loadEngine, solve, addScans
+from robotArmPlanner import PlannerError, planEngine
+
+helpCalibration = '''
+=================== calibrate action budgets ===================
+
+  python robotArmCalibration.py
+    runs a reference strategy headless on 1000 seeded starts of every challenge
+    and prints per challenge the distribution of actions and scans with suggested
+    'levels' and 'scans' values
+
+  options:
+    --runs 5000                 seeded starts per challenge, seeds 0..runs-1
+    --challenge challenges_intermediate[3] challenges_advanced[2]
+                                only these challenges
+    --strategy solver           shortest actions (robotArmSolver.py) instead of the
+                                greedy planner (robotArmPlanner.py), slower
+    --percentile 95             suggest the budget that this percentage of starts fits in
+    --level 2                   level to calibrate, budgets only count at level 3
+    --workers 4                 number of processes, default: all cores
+
+  starts with random colors are scanned once per grab, as a program that has to find out
+  the colors would do; at level 3 '*' always gives its maximum number of boxes
+'''
+
+_challenges = None
+_memo = {}
+
+def _challenge(label):
+  global _challenges
+  if _challenges is None:
+    _challenges = dict(allChallenges())
+  return _challenges[label]
+
+def _hasRandom(challenge):
+  return any(char in challenge.get('start','') for char in '?x') or bool(challenge.get('symbols'))
+
+def calibrateRun(run):
+  # actions and scans of the strategy on one seeded start, None if it found no solution
+  label, seed, level, strategy = run
+  challenge = _challenge(label)
+  engine = loadEngine(challenge, level, seed)
+  key = (label, level, strategy, engine._yardStart) # same start, same result
+  if key not in _memo:
+    try:
+      if strategy == 'solver':
+        actions = solve(engine, 200000)
+      else:
+        actions = planEngine(engine)
+    except (PlannerError, SolverLimit):
+      actions = None
+    if actions is not None:
+      scans = actions.count('grab') if _hasRandom(challenge) else 0
+      scans = max(scans, engine._scansMin or 0)
+      actions = addScans(actions, scans)
+      _memo[key] = (len(actions), actions.count('scan'))
+    else:
+      _memo[key] = None
+  return label, _memo[key]
+
+def percentile(values, percent):
+  # nearest rank
+  values = sorted(values)
+  return values[max(0, math.ceil(percent / 100 * len(values)) - 1)]
+
+def suggestLevels(levels, level, lines, actions):
+  parts = [part for part in (levels or '').split(',') if part]
+  spec = f'{level}:{lines or "<lines>"}/{actions}' # no lines known yet: fill in
+  for index, part in enumerate(parts):
+    if part.split(':')[0] == str(level):
+      parts[index] = spec
+      break
+  else:
+    parts.append(spec)
+  return ','.join(parts)
+
+def calibrate(labels, runs = 1000, level = 3, strategy = 'planner', percent = 99, workers = None):
+  tasks = [(label, seed, level, strategy) for label in labels for seed in range(runs)]
+  results = {label: [] for label in labels}
+  with multiprocessing.Pool(workers or os.cpu_count()) as pool:
+    for label, result in pool.imap_unordered(calibrateRun, tasks, chunksize=max(1, runs // 16)):
+      results[label].append(result)
+
+  for label in labels:
+    challenge = _challenge(label)
+    engine = loadEngine(challenge, level, 0)
+    found = [result for result in results[label] if result is not None]
+    report = {'challenge': label, 'name': challenge.get('name',''), 'runs': len(results[label]), 'failed': len(results[label]) - len(found),
+              'levels': challenge.get('levels',''), 'scans': challenge.get('scans','')}
+    if found:
+      for index, field in enumerate(['actions','scans']):
+        values = [result[index] for result in found]
+        report[field + 'Stats'] = (min(values), statistics.median(values), percentile(values, percent), max(values))
+      budget = report['actionsStats'][2]
+      report['suggestLevels'] = suggestLevels(report['levels'], level, engine._limitLines, budget)
+      scans = report['scansStats']
+      scansMin = engine._scansMin or scans[0]
+      report['suggestScans'] = f'{scansMin}:{max(scans[2], scansMin)}' if scans[3] or engine._scansMin else ''
+    yield report
+
+def main(argv = None):
+  parser = argparse.ArgumentParser(description='calibrate the action budgets of robotarm challenges', epilog=helpCalibration, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('--runs', type=int, default=1000, help='seeded starts per challenge, default: 1000')
+  parser.add_argument('--challenge', nargs='+', help='labels of challenges, like challenges_advanced[2], default: all')
+  parser.add_argument('--strategy', choices=['planner','solver'], default='planner')
+  parser.add_argument('--percentile', type=float, default=99, help='percentage of starts the suggested budget fits, default: 99')
+  parser.add_argument('--level', type=int, default=3)
+  parser.add_argument('--workers', type=int, default=None, help='number of processes, default: all cores')
+  args = parser.parse_args(argv)
+
+  labels = [label for label, _ in allChallenges()]
+  if args.challenge:
+    unknown = [label for label in args.challenge if label not in labels]
+    if unknown:
+      parser.error(f'unknown challenge: {", ".join(unknown)}')
+    labels = args.challenge
+
+  started = time.perf_counter()
+  p = f'p{args.percentile:g}'
+  print(f'{"challenge":28} {"runs":>5} {"fail":>4}  {"actions min/median/"+p+"/max":26} {"scans min/median/"+p+"/max":24}  levels -> suggested   scans -> suggested')
+  for report in calibrate(labels, args.runs, args.level, args.strategy, args.percentile, args.workers):
+    actions = '/'.join(f'{value:g}' for value in report['actionsStats']) if 'actionsStats' in report else '-'
+    scans = '/'.join(f'{value:g}' for value in report['scansStats']) if 'scansStats' in report else '-'
+    print(f'{report["challenge"]:28} {report["runs"]:>5} {report["failed"]:>4}  {actions:26} {scans:24}  '
+          f'{report["levels"] or "-"} -> {report.get("suggestLevels","-")}   {report["scans"] or "-"} -> {report.get("suggestScans") or "-"}')
+  print(f'total {time.perf_counter() - started:.3f} seconds')
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,288 @@
+import os
+import sys
+import types
+import runpy
+import argparse
+import pygame
+from RobotArm import RobotArm
+
+helpExport = '''
+=================== export animations ===================
+
+  python robotArmExport.py run.rat run.gif
+    replays a trace (robotArmTrace.py) offscreen and writes it as an animated gif
+  python robotArmExport.py run.rat frames --speed 3
+    writes a png sequence frames/frame00000.png, frames/frame00001.png, ... instead
+  python robotArmExport.py robotarm-1.py run.gif
+    runs a program offscreen, its RobotArm is exported
+
+  options:
+    --speed 2          speed of the animation 0..5, default 1
+    --fps 10           frames per second exported, default 25
+    --hold 3000        milliseconds the last frame stays, default 1000
+    --challenge challenges_basic[2]
+                       challenge of the trace if the trace does not name it
+
+  robotArm.startExport('run.gif', fps = 25)
+    exports every frame a RobotArm draws from now on, also with a window
+  robotArm.stopExport()
+    writes the last frame and closes the file
+
+  frames are sampled at the fps from the animation time, not from the time the
+  computer takes; equal frames are merged, a gif frame only holds the changed rectangle
+  offscreen needs no display: without one set SDL_VIDEODRIVER=dummy (this script does)
+'''
+
+class ExportError(Exception):
+  pass
+
+def _changes(surface, previous):
+  # rectangle around the pixels that differ from the previous frame, None if equal
+  if previous is None:
+    return surface.get_rect()
+  mask = pygame.mask.from_threshold(surface, (0,0,0,255), (1,1,1,255), previous)
+  mask.invert()
+  rects = mask.get_bounding_rects()
+  if not rects:
+    return None
+  return rects[0].unionall(rects[1:])
+
+class _Palette(dict):
+  # RGBX pixel as int: index of the nearest palette color, looked up once per color
+  def __init__(self, colors):
+    super().__init__()
+    self.colors = colors
+
+  def __missing__(self, pixel):
+    r, g, b = pixel.to_bytes(4, sys.byteorder)[:3]
+    best = min(range(len(self.colors)), key = lambda i: (self.colors[i][0] - r) ** 2 + (self.colors[i][1] - g) ** 2 + (self.colors[i][2] - b) ** 2)
+    if len(self) > 65536: self.clear()
+    self[pixel] = best
+    return best
+
+def viewPalette():
+  # the colors of the view exactly, then a color cube and grays for text and sprites
+  colors = [RobotArm._backgroundColor, (250,250,100), tuple(RobotArm._transparentPenColor), RobotArm._penColor,
+            RobotArm._backgroundColorAccu, (255,0,0), (200,50,50)]
+  colors += [c['color'] for c in RobotArm._colors if c['color']]
+  colors += [(r, g, b) for r in range(0, 256, 51) for g in range(0, 256, 51) for b in range(0, 256, 51)]
+  seen = set()
+  colors = [color for color in colors if not (color in seen or seen.add(color))]
+  missing = 256 - len(colors)
+  colors += [(gray, gray, gray) for gray in (round(255 * (i + 1) / (missing + 1)) for i in range(missing))]
+  return colors[:256]
+
+def _lzw(indices, codeSize = 8):
+  # gif variant: variable code width from codeSize+1 up to 12 bits, lsb first
+  clear = 1 << codeSize
+  output = bytearray()
+  buffer = clear
+  bits = codeSize + 1
+  width = codeSize + 1
+  codes = {}
+  nextCode = clear + 2
+  prefix = indices[0]
+  for index in indices[1:]:
+    key = prefix << 8 | index
+    code = codes.get(key)
+    if code is not None:
+      prefix = code
+      continue
+    buffer |= prefix << bits
+    bits += width
+    if nextCode == 1 << width and width < 12:
+      width += 1
+    if nextCode < 4096:
+      codes[key] = nextCode
+      nextCode += 1
+    else:
+      buffer |= clear << bits
+      bits += width
+      codes = {}
+      nextCode = clear + 2
+      width = codeSize + 1
+    while bits >= 8:
+      output.append(buffer & 255)
+      buffer >>= 8
+      bits -= 8
+    prefix = index
+  buffer |= prefix << bits
+  bits += width
+  if nextCode == 1 << width and width < 12:
+    width += 1
+  buffer |= (clear + 1) << bits
+  bits += width
+  while bits > 0:
+    output.append(buffer & 255)
+    buffer >>= 8
+    bits -= 8
+  return output
+
+class GifWriter:
+  # animated gif, written frame by frame: only the previous frame is kept
+  def __init__(self, path, loop = 0):
+    self.path = path
+    self.loop = loop
+    self.palette = viewPalette()
+    self._lookup = _Palette(self.palette)
+    self._file = None
+    self._previous = None # surface of the last frame added
+    self._pending = None # (rect, indices, milliseconds) of that frame, written when the next differs
+    self.frames = 0
+
+  def _open(self, size):
+    self._file = open(self.path, 'wb')
+    width, height = size
+    self._file.write(b'GIF89a' + width.to_bytes(2, 'little') + height.to_bytes(2, 'little') + bytes([0xf7, 0, 0]))
+    self._file.write(b''.join(bytes(color) for color in self.palette))
+    self._file.write(b'!\xff\x0bNETSCAPE2.0\x03\x01' + self.loop.to_bytes(2, 'little') + b'\x00')
+
+  def add(self, surface, milliseconds):
+    rect = _changes(surface, self._previous)
+    if rect is None:
+      self._pending = self._pending[:2] + (self._pending[2] + milliseconds,)
+      return
+    if self._file is None:
+      self._open(surface.get_size())
+    elif self._previous.get_size() != surface.get_size():
+      raise ExportError('frames of a gif must have the same size')
+    self._flush()
+    pixels = memoryview(pygame.image.tobytes(surface.subsurface(rect), 'RGBX')).cast('I')
+    self._pending = (rect, bytes(map(self._lookup.__getitem__, pixels)), milliseconds)
+    self._previous = surface.copy()
+
+  def _flush(self):
+    if self._pending is None: return
+    rect, indices, milliseconds = self._pending
+    self._pending = None
+    delay = max(2, round(milliseconds / 10)) # hundredths of seconds, browsers play less than 2 as 10
+    self._file.write(b'!\xf9\x04\x04' + delay.to_bytes(2, 'little') + b'\x00\x00') # keep the previous frame
+    self._file.write(b',' + b''.join(value.to_bytes(2, 'little') for value in rect) + b'\x00\x08')
+    data = _lzw(indices)
+    for start in range(0, len(data), 255):
+      block = data[start:start + 255]
+      self._file.write(bytes([len(block)]) + block)
+    self._file.write(b'\x00')
+    self.frames += 1
+
+  def close(self):
+    if self._file is None: return
+    self._flush()
+    self._file.write(b';')
+    self._file.close()
+    self._file = None
+
+class PngWriter:
+  # png sequence in a directory, equal frames are written once
+  def __init__(self, directory, prefix = 'frame'):
+    self.directory = directory
+    self.prefix = prefix
+    self._previous = None
+    self.frames = 0
+    os.makedirs(directory, exist_ok = True)
+
+  def add(self, surface, milliseconds):
+    if self._previous is not None and _changes(surface, self._previous) is None: return
+    pygame.image.save(surface, os.path.join(self.directory, f'{self.prefix}{self.frames:05d}.png'))
+    self._previous = surface.copy()
+    self.frames += 1
+
+  def close(self):
+    pass
+
+class FrameExport:
+  # samples the frames of a RobotArm at a fixed rate of animation time and passes them to a writer
+  def __init__(self, path, fps = 25, hold = 1000):
+    self.path = path
+    self.interval = 1000 / fps
+    self.hold = hold
+    self._writer = GifWriter(path) if path.lower().endswith('.gif') else PngWriter(path)
+    self._time = 0 # animation time in milliseconds at the start of the next frame
+    self._last = None # surface of the last frame, if it was not exported
+
+  def frame(self, surface, milliseconds = None):
+    # a frame shown for milliseconds, None: exported as a single frame
+    tick = -(-self._time // self.interval) # first sample at or after the start of this frame
+    if milliseconds is None:
+      milliseconds = (tick + 1) * self.interval - self._time
+    self._time += milliseconds
+    ticks = -(-self._time // self.interval) - tick
+    if ticks > 0:
+      self._writer.add(surface, ticks * self.interval)
+    self._last = surface if ticks <= 0 else None
+
+  def close(self, surface = None):
+    # the final frame stays hold milliseconds, as a gif plays again from the start
+    surface = self._last if surface is None else surface
+    if surface is not None:
+      self._writer.add(surface, self.hold)
+    self._writer.close()
+    return self._writer.frames
+
+class OffscreenRobotArm(RobotArm):
+  # draws on a surface instead of a window, without delays and without waiting for keys
+  _offscreen = True
+
+def exportTrace(trace, path, speed = 1, fps = 25, hold = 1000, challenge = None):
+  import robotArmTrace
+  header = trace.header
+  challenge = challenge or robotArmTrace.findChallenge(header.get('challenge') or '')
+  if challenge is None:
+    raise ExportError(f"challenge {header.get('challenge')} not found, pass the challenge to export")
+  arm = OffscreenRobotArm(challenge, header['level'], speed, header['seed'])
+  arm.startExport(path, fps, hold)
+  robotArmTrace._restoreStart(arm._engine, header)
+  arm._engine._notify('load')
+  for action, _, _ in trace:
+    getattr(arm, robotArmTrace.METHODS[action])()
+  return arm.stopExport()
+
+def exportProgram(program, path, speed = 1, fps = 25, hold = 1000):
+  # runs a program with every RobotArm(...) it makes offscreen, the last one is exported
+  arms = []
+  def factory(*args, **kwargs):
+    if arms:
+      arms[-1].stopExport()
+    values = dict(zip(['challenge', 'level', 'speed', 'seed'], args), **kwargs)
+    values['speed'] = speed
+    arm = OffscreenRobotArm(**values)
+    arm.startExport(path, fps, hold)
+    arms.append(arm)
+    return arm
+  import robotArmExport # loaded now, as RobotArm.startExport imports it while the program sees the shim
+  shim = types.ModuleType('RobotArm')
+  shim.RobotArm = factory
+  saved = sys.modules.get('RobotArm')
+  sys.modules['RobotArm'] = shim
+  try:
+    runpy.run_path(program, run_name='__main__')
+  except SystemExit:
+    pass
+  finally:
+    sys.modules['RobotArm'] = saved
+  if not arms:
+    raise ExportError(f'{program} made no RobotArm')
+  return arms[-1].stopExport()
+
+def main(argv = None):
+  parser = argparse.ArgumentParser(description='export a robotarm animation as gif or png sequence', epilog=helpExport, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('source', help='trace (.rat) or program (.py)')
+  parser.add_argument('output', help='gif file (.gif) or directory for a png sequence')
+  parser.add_argument('--speed', type=int, default=1, help='speed 0..5, default: 1')
+  parser.add_argument('--fps', type=float, default=25, help='frames per second, default: 25')
+  parser.add_argument('--hold', type=int, default=1000, help='milliseconds the last frame stays, default: 1000')
+  parser.add_argument('--challenge', default=None, help='label of the challenge, default: from the trace')
+  args = parser.parse_args(argv)
+
+  os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+  if args.source.endswith('.py'):
+    frames = exportProgram(args.source, args.output, args.speed, args.fps, args.hold)
+  else:
+    import robotArmTrace
+    trace = robotArmTrace.Trace.load(args.source)
+    challenge = robotArmTrace.findChallenge(args.challenge) if args.challenge else None
+    frames = exportTrace(trace, args.output, args.speed, args.fps, args.hold, challenge)
+  print(f'{frames} frames written to {args.output}')
+
+if __name__ == "__main__":
+  main()
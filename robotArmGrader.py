@@ -0,0 +1,216 @@
+import os
+import sys
+import io
+import csv
+import json
+import time
+import types
+import runpy
+import signal
+import argparse
+import contextlib
+import multiprocessing
+import multiprocessing.connection
+import robotArmChallenges
+from RobotArmEngine import RobotArmEngine
+from robotArmTrace import Trace
+
+helpGrader = '''
+=================== grade submissions ===================
+
+  python robotArmGrader.py submissions challenges_basic
+    runs every submissions/*.py headless against every challenge of challenges_basic at level 3
+    and prints one csv row per run with the mission result and the reasons it failed
+
+  options:
+    --challenge 1 3   only these challenges of the set
+    --level 2 3       grade at these levels
+    --seed 1 2 3      grade every run with these seeds, so random starts are the same for every submission
+    --traces traces   save the actions of every run in this directory, replay with robotArmTrace.py
+    --timeout 10      seconds per run before it is stopped, a run that catches the stop is killed TIMEOUT_MARGIN later
+    --workers 4       number of processes, default: all cores
+    --format json     json lines instead of csv
+'''
+
+FIELDS = ['submission','challenges','challenge','level','seed','result','reasons','actions','scans','lines','errors','warnings','seconds','trace']
+TIMEOUT_MARGIN = 2 # seconds after the timeout before the process of a run is killed
+
+class GradeTimeout(BaseException): # BaseException: not caught by a students' except Exception
+  pass
+
+def _raiseTimeout(signum, frame):
+  raise GradeTimeout()
+
+def _armFactory(path, challenge, level, seed, arms, trace):
+  # replaces RobotArm(challenge, level) in a submission by a headless engine on the graded challenge, level and seed
+  def RobotArm(*args, **kwargs):
+    engine = RobotArmEngine(None, codeFile = path)
+    engine.addObserver(trace)
+    engine.loadDims(challenge)
+    engine.load(challenge, level, seed)
+    arms.append(engine)
+    return engine
+  return RobotArm
+
+def _emptyRow(run):
+  path, challengesName, key, level, seed, timeout, traces = run
+  return {'submission': os.path.basename(path), 'challenges': challengesName, 'challenge': key, 'level': level, 'seed': seed,
+          'result': '', 'reasons': '', 'actions': 0, 'scans': 0, 'lines': 0, 'errors': 0, 'warnings': 0, 'seconds': 0, 'trace': ''}
+
+def gradeRun(run):
+  path, challengesName, key, level, seed, timeout, traces = run
+  challenge = getattr(robotArmChallenges, challengesName)[key]
+  row = _emptyRow(run)
+  arms = []
+  trace = Trace(f'{challengesName}[{key}]')
+  shim = types.ModuleType('RobotArm')
+  shim.RobotArm = _armFactory(path, challenge, level, seed, arms, trace)
+  savedModule = sys.modules.get('RobotArm')
+  sys.modules['RobotArm'] = shim
+  savedStdin = sys.stdin
+  sys.stdin = io.StringIO('') # input() raises EOFError instead of blocking
+  savedPath = sys.path[:]
+  sys.path.insert(0, os.path.dirname(os.path.abspath(path))) # modules next to the submission, like python submission.py
+  useAlarm = timeout and hasattr(signal, 'SIGALRM')
+  if useAlarm:
+    signal.signal(signal.SIGALRM, _raiseTimeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+  started = time.perf_counter()
+  try:
+    with contextlib.redirect_stdout(io.StringIO()):
+      runpy.run_path(path, run_name='__main__')
+  except GradeTimeout:
+    row['result'] = 'TIMEOUT'
+  except SystemExit:
+    pass
+  except BaseException as error:
+    row['result'] = 'CRASHED'
+    row['reasons'] = f'{type(error).__name__}: {error}'
+  finally:
+    if useAlarm:
+      signal.setitimer(signal.ITIMER_REAL, 0)
+    sys.stdin = savedStdin
+    sys.path[:] = savedPath
+    if savedModule is None:
+      sys.modules.pop('RobotArm', None)
+    else:
+      sys.modules['RobotArm'] = savedModule
+  row['seconds'] = round(time.perf_counter() - started, 4)
+  if traces and arms:
+    name = os.path.splitext(os.path.basename(path))[0]
+    row['trace'] = os.path.join(traces, f'{name}-{challengesName}-{key}-{level}-{seed}.rat')
+    trace.save(row['trace'])
+
+  if not arms:
+    row['result'] = row['result'] or 'NO ROBOTARM'
+    return row
+  engine = arms[-1]
+  state, fails = engine.missionResult()
+  if not row['result']:
+    row['result'] = state
+    row['reasons'] = ', '.join(fails)
+  row['actions'] = engine._actions
+  row['scans'] = engine._scans
+  row['lines'] = engine._lines
+  row['errors'] = engine._criticals['e']
+  row['warnings'] = engine._criticals['w']
+  return row
+
+def _gradeInProcess(run, connection):
+  connection.send(gradeRun(run))
+  connection.close()
+
+def _startRun(run):
+  receiver, sender = multiprocessing.Pipe(duplex=False)
+  process = multiprocessing.Process(target=_gradeInProcess, args=(run, sender), daemon=True)
+  process.start()
+  sender.close()
+  return {'run': run, 'process': process, 'receiver': receiver, 'started': time.perf_counter()}
+
+def _finishRun(active, row):
+  active['receiver'].close()
+  active['process'].join()
+  row['seconds'] = row['seconds'] or round(time.perf_counter() - active['started'], 4)
+  return row
+
+def gradeRuns(submissions, challengesName, keys = None, levels = (3,), timeout = 10, workers = None, seeds = (None,), traces = None):
+  challenges = getattr(robotArmChallenges, challengesName)
+  unknown = [key for key in keys or [] if key not in challenges]
+  if unknown:
+    raise ValueError(f'unknown challenges in {challengesName}: {unknown}')
+  keys = keys if keys else sorted(challenges)
+  runs = [(path, challengesName, key, level, seed, timeout, traces) for path in submissions for key in keys for level in levels for seed in seeds]
+  # every run gets a fresh process, so submissions can not influence each other, and a process that
+  # does not stop by itself (a student catching the timeout) is killed after timeout + TIMEOUT_MARGIN
+  workers = workers or os.cpu_count()
+  rows = {}
+  active = {} # index of the run: started process
+  started = 0
+  for index in range(len(runs)):
+    while index not in rows:
+      while started < len(runs) and len(active) < workers:
+        active[started] = _startRun(runs[started])
+        started += 1
+      wait = None
+      if timeout:
+        deadline = min(run['started'] for run in active.values()) + timeout + TIMEOUT_MARGIN
+        wait = max(0, deadline - time.perf_counter())
+      ready = multiprocessing.connection.wait([run['receiver'] for run in active.values()], wait)
+      for number, run in list(active.items()):
+        if run['receiver'] in ready:
+          try:
+            row = run['receiver'].recv()
+          except EOFError: # the process ended without a row
+            run['process'].join()
+            row = _emptyRow(run['run'])
+            row['result'] = 'CRASHED'
+            row['reasons'] = f'process exited with code {run["process"].exitcode}'
+        elif timeout and time.perf_counter() - run['started'] >= timeout + TIMEOUT_MARGIN:
+          run['process'].kill() # not terminate: pygame and submissions may handle SIGTERM
+          row = _emptyRow(run['run'])
+          row['result'] = 'TIMEOUT'
+        else:
+          continue
+        rows[number] = _finishRun(active.pop(number), row)
+    yield rows.pop(index)
+
+def findSubmissions(directory):
+  return sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.endswith('.py'))
+
+def main(argv = None):
+  parser = argparse.ArgumentParser(description='grade robotarm submissions headless', epilog=helpGrader, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('submissions', help='directory with submissions (*.py) or a single submission')
+  parser.add_argument('challenges', help='name of a challenge set in robotArmChallenges, like challenges_basic')
+  parser.add_argument('--challenge', type=int, nargs='+', help='challenges of the set to grade, default: all')
+  parser.add_argument('--level', type=int, nargs='+', default=[3], help='levels to grade, default: 3')
+  parser.add_argument('--seed', type=int, nargs='+', default=[None], help='seeds for random starts, default: unseeded')
+  parser.add_argument('--timeout', type=float, default=10, help='seconds per run, default: 10')
+  parser.add_argument('--workers', type=int, default=None, help='number of processes, default: all cores')
+  parser.add_argument('--traces', default=None, help='directory to save a trace of every run')
+  parser.add_argument('--format', choices=['csv','json'], default='csv')
+  args = parser.parse_args(argv)
+
+  if not isinstance(getattr(robotArmChallenges, args.challenges, None), dict):
+    parser.error(f'unknown challenge set: {args.challenges}')
+  unknown = [key for key in args.challenge or [] if key not in getattr(robotArmChallenges, args.challenges)]
+  if unknown:
+    parser.error(f'unknown challenges in {args.challenges}: {" ".join(map(str, unknown))}')
+  if os.path.isdir(args.submissions):
+    submissions = findSubmissions(args.submissions)
+  else:
+    submissions = [args.submissions]
+
+  if args.traces:
+    os.makedirs(args.traces, exist_ok=True)
+  rows = gradeRuns(submissions, args.challenges, args.challenge, args.level, args.timeout, args.workers, args.seed, args.traces)
+  if args.format == 'csv':
+    writer = csv.DictWriter(sys.stdout, fieldnames=FIELDS)
+    writer.writeheader()
+    for row in rows:
+      writer.writerow(row)
+  else:
+    for row in rows:
+      print(json.dumps(row))
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,306 @@
+import time
+import random
+import argparse
+from robotArmSolver import addScans, allChallenges, loadEngine, runActions
+
+helpPlanner = '''
+=================== plan challenges ===================
+
+  planChallenge(challenge, level)
+    returns a list of actions ('left', 'right', 'grab', 'drop', 'scan') that reaches
+    the solution of the challenge, not the shortest but fast for any size of yard
+
+  python robotArmPlanner.py
+    plans all challenges of robotArmChallenges and compares them with the maximum actions of level 3
+  python robotArmPlanner.py --stacks 300 --layers 30
+    plans a random yard of that size
+
+  greedy, towards the target yard (the solution or the example solution of the criteria):
+  - a stack is ready if it holds a correct start of its target, without other boxes on top
+  - a box on top of the wrong boxes that a ready stack needs next is moved there directly
+  - otherwise the boxes above a needed box are moved out of the way to the nearest stack
+    that is not ready, preferably without burying other needed boxes
+  - criteria are checked after every drop, so planning stops as soon as they are met
+  - when the yard returns to an earlier state, boxes are put aside at random for a while
+  the planner can fail on small, nearly full yards that robotArmSolver.py does solve
+'''
+
+class PlannerError(Exception):
+  pass
+
+class Planner:
+  def __init__(self, stacks, target, maxLayers, stack = 0, held = '', goal = None, seed = 0):
+    if len(stacks) != len(target):
+      raise PlannerError(f'yard has {len(stacks)} stacks, target {len(target)}')
+    if sorted(''.join(stacks) + held) != sorted(''.join(target)):
+      raise PlannerError('target holds other boxes than the yard')
+    if max([len(boxes) for boxes in target] + [0]) > maxLayers:
+      raise PlannerError(f'target has stacks higher than {maxLayers} layers')
+    self.stacks = [list(boxes) for boxes in stacks]
+    self.target = list(target)
+    self.maxLayers = maxLayers
+    self.stack = stack
+    self.held = held
+    self.goal = goal
+    self.actions = []
+    self._lastStack = None # stack of the last grab or drop
+    self._random = random.Random(seed)
+    self._shake = 0 # steps left to put boxes aside at random, to get out of a cycle
+    self._hash = 0 # of the yard, updated per grab and drop
+    self._ready = {} # color: stacks that need that color next
+    self._junkColors = [{} for _ in self.stacks] # per stack the colors on top of its correct start
+    self._needs = [''] * len(self.stacks)
+    self._correct = [0] * len(self.stacks)
+    self._remaining = len(self.stacks)
+    for index in range(len(self.stacks)):
+      self._changed(index, False)
+
+  def _prefix(self, index):
+    boxes = self.stacks[index]
+    target = self.target[index]
+    length = 0
+    while length < len(boxes) and length < len(target) and boxes[length] == target[length]:
+      length += 1
+    return length
+
+  def _isDone(self, index):
+    return len(self.stacks[index]) == self._correct[index] == len(self.target[index])
+
+  def _isReady(self, index):
+    return len(self.stacks[index]) == self._correct[index] < len(self.target[index])
+
+  def _need(self, index):
+    return self.target[index][self._correct[index]]
+
+  def _changed(self, index, wasDone):
+    if self._needs[index]:
+      self._ready[self._needs[index]].discard(index)
+    self._correct[index] = self._prefix(index)
+    self._remaining += wasDone - self._isDone(index)
+    self._needs[index] = self._need(index) if self._isReady(index) else ''
+    if self._needs[index]:
+      self._ready.setdefault(self._needs[index], set()).add(index)
+    junkColors = {}
+    for box in self.stacks[index][self._correct[index]:]:
+      junkColors[box] = junkColors.get(box, 0) + 1
+    self._junkColors[index] = junkColors
+
+  def _moveTo(self, index):
+    distance = index - self.stack
+    self.actions.extend([('right' if distance > 0 else 'left')] * abs(distance))
+    self.stack = index
+
+  def _grab(self, index):
+    wasDone = self._isDone(index)
+    self._moveTo(index)
+    self.held = self.stacks[index].pop()
+    self._hash ^= hash((index, len(self.stacks[index]), self.held))
+    if self.held == 'i':
+      self.held = 't'
+    self.actions.append('grab')
+    self._lastStack = index
+    self._changed(index, wasDone)
+
+  def _drop(self, index):
+    wasDone = self._isDone(index)
+    self._moveTo(index)
+    self._hash ^= hash((index, len(self.stacks[index]), self.held))
+    self.stacks[index].append(self.held)
+    self.held = ''
+    self.actions.append('drop')
+    self._lastStack = index
+    self._changed(index, wasDone)
+
+  def _reached(self):
+    if self.goal:
+      return self.goal([''.join(boxes) for boxes in self.stacks])
+    return self._remaining == 0
+
+  def _nearest(self, indices, at = None):
+    at = self.stack if at is None else at
+    best = None
+    for index in indices:
+      if best is None or abs(index - at) < abs(best - at):
+        best = index
+    return best
+
+  def _buffer(self, avoid):
+    # nearest stack with space that is not ready, burying as few needed boxes as possible
+    needs = [color for color, indices in self._ready.items() if indices]
+    scale = 2 * len(self.stacks)
+    best = None
+    bestScore = None
+    for index in range(len(self.stacks)):
+      if index in avoid or len(self.stacks[index]) >= self.maxLayers: continue
+      if self._shake:
+        score = self._random.random()
+        if bestScore is None or score < bestScore:
+          best, bestScore = index, score
+        continue
+      score = abs(index - self.stack)
+      if self._needs[index]:
+        score += 2 * scale # blocks a stack that is being built
+      junkColors = self._junkColors[index]
+      for color in needs:
+        score += scale * junkColors.get(color, 0)
+      if bestScore is None or score < bestScore:
+        best, bestScore = index, score
+    if best is None:
+      raise PlannerError('no room left to put a box aside')
+    return best
+
+  def _step(self):
+    if self.held:
+      targets = self._ready.get(self.held, set()) - {self._lastStack}
+      if targets:
+        self._drop(self._nearest(sorted(targets)))
+      else:
+        self._drop(self._buffer({self._lastStack}))
+      return
+
+    # stacks with wrong boxes are never ready, so any ready stack can take their needed boxes
+    needs = {color for color, indices in self._ready.items() if indices}
+
+    # a needed box on top of wrong boxes: move it directly
+    best = None
+    for index in range(len(self.stacks)):
+      if index == self._lastStack or len(self.stacks[index]) == self._correct[index]: continue
+      color = self.stacks[index][-1]
+      if color not in needs: continue
+      dest = self._nearest(sorted(self._ready[color]), index)
+      cost = abs(self.stack - index) + abs(index - dest)
+      if best is None or cost < best[0]:
+        best = (cost, index)
+    if best:
+      self._grab(best[1])
+      return
+
+    # dig up the needed box that is covered by the fewest boxes
+    best = None
+    for index in range(len(self.stacks)):
+      if index == self._lastStack or needs.isdisjoint(self._junkColors[index]): continue
+      boxes = self.stacks[index]
+      depth = 0
+      while boxes[-1 - depth] not in needs:
+        depth += 1
+      cost = (depth, abs(self.stack - index))
+      if best is None or cost < best[0]:
+        best = (cost, index)
+    if best:
+      self._grab(best[1])
+      return
+
+    # nothing ready to build on: clear the unfinished stack with the fewest wrong boxes
+    best = None
+    for index in range(len(self.stacks)):
+      junk = len(self.stacks[index]) - self._correct[index]
+      if junk == 0: continue
+      if self._shake:
+        cost = (index == self._lastStack, self._random.random())
+      else:
+        cost = (index == self._lastStack, self._correct[index] == len(self.target[index]), junk, abs(self.stack - index))
+      if best is None or cost < best[0]:
+        best = (cost, index)
+    if best is None:
+      raise PlannerError('no box left to move')
+    self._grab(best[1])
+
+  def plan(self):
+    boxes = sum(len(boxes) for boxes in self.stacks) + 1
+    maxSteps = 2 * boxes * (self.maxLayers + 1) + 10
+    steps = 0
+    seen = set()
+    while self.held or not self._reached():
+      steps += 1
+      if steps > maxSteps:
+        raise PlannerError(f'no plan within {maxSteps} grabs and drops')
+      self._shake = max(0, self._shake - 1)
+      self._step()
+      if not self.held:
+        state = (self._hash, self.stack)
+        if state in seen:
+          self._shake = 2 * len(self.stacks)
+        seen.add(state)
+      if not self.held and self.goal and self._reached():
+        break
+    return self.actions
+
+def planYard(stacks, target, maxLayers, stack = 0, held = '', goal = None, seed = 0):
+  return Planner(stacks, target, maxLayers, stack, held, goal, seed).plan()
+
+def planEngine(engine):
+  # actions that take the engine from its current state to a solution
+  compiled = engine._compiledSolution
+  goal = None
+  if type(engine._solution) is str:
+    target = engine._solution.split(',')
+  elif compiled:
+    target = compiled.example().split(',')
+    goal = compiled.check
+  elif callable(engine._example):
+    target = engine._example(engine._yardStart, engine._criteria).split(',')
+    goal = lambda stacks: engine._solution(engine._yardStart, ','.join(stacks), engine._criteria)
+  else:
+    raise PlannerError('challenge has no solution to plan for')
+  return planYard(engine._stackStrings, target, engine._maxLayers, engine._stack, engine._color, goal)
+
+def planChallenge(challenge, level = 3, scans = False, seed = None):
+  # scans: scan after every grab, like a program that has to find out the colors
+  engine = loadEngine(challenge, level, seed)
+  actions = planEngine(engine)
+  if scans:
+    actions = addScans(actions, actions.count('grab'))
+  if engine._scansMin and actions.count('scan') < engine._scansMin:
+    actions = addScans(actions, engine._scansMin - actions.count('scan'))
+  return actions
+
+def randomYard(stacks, layers, colors = 'rgbwy', fill = 0.5):
+  boxes = [random.choice(colors) for _ in range(int(stacks * layers * fill))]
+  yard = [[] for _ in range(stacks)]
+  for box in boxes:
+    index = random.randrange(stacks)
+    while len(yard[index]) >= layers:
+      index = random.randrange(stacks)
+    yard[index].append(box)
+  return [''.join(boxes) for boxes in yard]
+
+def main(argv = None):
+  parser = argparse.ArgumentParser(description='plan robotarm challenges with a greedy strategy', epilog=helpPlanner, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('--seed', type=int, default=0, help='random seed for challenges with random boxes')
+  parser.add_argument('--stacks', type=int, default=0, help='plan a random yard with this many stacks instead')
+  parser.add_argument('--layers', type=int, default=20, help='layers of the random yard')
+  args = parser.parse_args(argv)
+
+  if args.stacks:
+    random.seed(args.seed)
+    yard = randomYard(args.stacks, args.layers)
+    target = list(yard)
+    random.shuffle(target)
+    started = time.perf_counter()
+    actions = planYard(yard, target, args.layers)
+    print(f'{args.stacks} stacks, {args.layers} layers, {sum(map(len, yard))} boxes: {len(actions)} actions in {time.perf_counter() - started:.3f} seconds')
+    return
+
+  print(f'{"challenge":32} {"name":32} {"actions":>7} {"budget":>6} {"seconds":>8}  remark')
+  for label, challenge in allChallenges():
+    started = time.perf_counter()
+    remark = ''
+    try:
+      actions = planChallenge(challenge, seed = args.seed)
+    except PlannerError as error:
+      actions = None
+      remark = str(error)
+    seconds = time.perf_counter() - started
+    engine = loadEngine(challenge, 3, args.seed)
+    budget = engine._limitActions
+    if actions is not None:
+      state, fails = runActions(engine, actions)
+      fails = [fail for fail in fails if fail not in ['too many code lines', 'too many actions', 'warnings given']]
+      if state != 'ACCOMPLISHED' and fails:
+        remark = 'replay failed: ' + ', '.join(fails)
+      elif budget and len(actions) > budget:
+        remark = f'{len(actions) - budget} over budget'
+    print(f'{label:32} {challenge.get("name",""):32} {len(actions) if actions else "-":>7} {str(budget or "-"):>6} {seconds:8.3f}  {remark}')
+
+if __name__ == "__main__":
+  main()
@@ -1,3 +1,6 @@
+import re
+from functools import lru_cache
+
 def getDemocratieWinner(yardStart):
   char_count = {}
   _yard = yardStart.split(',')
@@ -30,104 +33,155 @@ def getDemocratieSolution(yardStart, criteria=''):
   return ','.join(_yard)
 
 def hasDemocratie(yardStart, yardNow, criteria=''):
-  solution = getDemocratieSolution(yardStart, criteria)
-  return yardNow == solution
+  return compileDemocratie(yardStart).check(yardNow.split(','))
 
 def hasColorNotAt(yardStart, yardNow, spec):
-  color = spec[0]
-  try:
-    indexNow = int(spec[2:])
-  except: 
-     return False
-
-  _yardNow = yardNow.split(',')   
-  if 0 <= indexNow < len(_yardNow) and _yardNow[indexNow].count(color) == 0:
-    return True
-
-  return False
+  return _checkSpec(yardStart, yardNow, spec)
 
 def hasColorCollectedAt(yardStart, yardNow, spec):
-  color = spec[0]
-  try:
-    indexNow = int(spec[2:])
-  except: 
-     return False
-
-  totalCounted = yardStart.count(color)
-  _yardNow = yardNow.split(',')   
-  if 0 <= indexNow < len(_yardNow) and _yardNow[indexNow].count(color) == totalCounted:
-    return True
-    
-  return False
+  return _checkSpec(yardStart, yardNow, spec)
 
 def hasColorMoved(yardStart, yardNow, spec):
-  color = spec[0]
-  try:
-    shift = int(spec[2])
-  except: 
-     return False
-  if spec[1] == '<':
-     shift = -1 * shift
-
-  _yardStart = yardStart.split(',')
-  _yardNow = yardNow.split(',')
-  _length = len(_yardStart)
-  for index in range(_length):
-     _countStart = _yardStart[index].count(color)
-     newIndex = index + shift
-     if 0 <= newIndex < _length:
-        _countNow = _yardNow[newIndex].count(color)
-        if _countStart != _countNow:
-           return False
-  return True
+  return _checkSpec(yardStart, yardNow, spec)
 
 def hasDistributedFromAt(yardStart, yardNow, spec):
+  return _checkSpec(yardStart, yardNow, spec)
+
+def _checkSpec(yardStart, yardNow, spec):
   try:
-    source = int(spec[0])
-    dest = int(spec[2])
-  except:
-     return False
-  if spec[1] == '}':
-    delta = 1
-  elif spec[1] == '{':
-    delta = -1
+    return compileCriteria(yardStart, spec).check(yardNow.split(','))
+  except ValueError:
+    return False
 
-  _yardStart = yardStart.split(',')
-  _yardNow = yardNow.split(',')
+def hasSolution(yardStart, yardNow, criteria):
+  if type(criteria) != str: return False
+  return compileCriteria(yardStart, criteria).check(yardNow.split(','))
 
-  for index in range(len(_yardStart[source])-1,-1,-1):
-    color = _yardStart[source][index]
-    if 0 <= dest < len(_yardNow):
-      if len(_yardNow[dest]) == 0 or color != _yardNow[dest][-1]:
-        return False
-    dest += delta
+########### COMPILED SOLUTIONS ###########
+# criteria are compiled once per start yard into checks per stack index,
+# so checking a yard only touches its stacks, and a changed stack only its own checks
 
-  return True
+_colorSpec = re.compile(r'^([a-z])([:<>\-])(\d+)$')       # r:6, b>2, w<1, g-3
+_distributionSpec = re.compile(r'^(\d+)([{}])(\d+)$')     # 2}4, 3{8
 
-def hasSolution(yardStart, yardNow, criteria):
-  if type(criteria) != str: return False
+class CompiledSolution:
+  def __init__(self, yardStart):
+    self.yardStart = yardStart
+    self.stacksStart = yardStart.split(',')
+    self.length = len(self.stacksStart)
+    self.checks = {} # stack index -> functions(stack) that must all hold
+    self._example = None
 
-  _specs = criteria.split(',')
-  checked = False
-  for _spec in _specs:
-    if _spec[1] == ':': 
-      if not hasColorCollectedAt(yardStart, yardNow,_spec): 
-        return False
-      checked = True
-    elif _spec[1] in ['}','{']: 
-      if not hasDistributedFromAt(yardStart, yardNow,_spec): 
-        return False
-      checked = True
-    elif _spec[1] in ['>','<']: 
-      if not hasColorMoved(yardStart, yardNow,_spec): 
-        return False
-      checked = True
-    elif _spec[1] == '-': 
-      if not hasColorNotAt(yardStart, yardNow,_spec): 
+  def _addCheck(self, index, check):
+    self.checks.setdefault(index, []).append(check)
+
+  def _checkIndex(self, index, spec):
+    if not 0 <= index < self.length:
+      raise ValueError(f'spot {index} in criteria {spec!r} is outside the yard of {self.length} spots')
+
+  @property
+  def indices(self):
+    return self.checks.keys()
+
+  def stackOk(self, index, stack):
+    for check in self.checks.get(index, ()):
+      if not check(stack):
         return False
-      checked = True
+    return True
 
-  return checked
+  def failing(self, stacks):
+    return {index for index in self.checks if index >= len(stacks) or not self.stackOk(index, stacks[index])}
+
+  def check(self, stacks):
+    return len(stacks) == self.length and not self.failing(stacks)
+
+  def example(self):
+    if self._example is None:
+      self._example = self._buildExample()
+    return self._example
+
+class CompiledCriteria(CompiledSolution):
+  def __init__(self, yardStart, criteria):
+    CompiledSolution.__init__(self, yardStart)
+    if type(criteria) != str or criteria == '':
+      raise ValueError(f"criteria must be a string like 'r:0,y:2', not {criteria!r}")
+    self.criteria = criteria
+    self.specs = []
+    self.rules = [] # (operator, color or source, spot)
+    for spec in criteria.split(','):
+      colorMatch = _colorSpec.match(spec)
+      distributionMatch = _distributionSpec.match(spec)
+      if colorMatch:
+        color, operator, number = colorMatch.groups()
+        self._compileColor(spec, color, operator, int(number))
+        self.rules.append((operator, color, int(number)))
+      elif distributionMatch:
+        source, operator, dest = distributionMatch.groups()
+        self._compileDistribution(spec, int(source), operator, int(dest))
+        self.rules.append((operator, int(source), int(dest)))
+      else:
+        raise ValueError(f"criteria {spec!r} not understood, use like 'r:6', 'b>2', 'w<1', 'g-3', '2}}4' or '3{{8'")
+      self.specs.append(spec)
+
+  def _compileColor(self, spec, color, operator, number):
+    if operator == ':':
+      self._checkIndex(number, spec)
+      total = self.yardStart.count(color)
+      self._addCheck(number, lambda stack, color=color, total=total: stack.count(color) == total)
+    elif operator == '-':
+      self._checkIndex(number, spec)
+      self._addCheck(number, lambda stack, color=color: stack.count(color) == 0)
+    else:
+      shift = number if operator == '>' else -number
+      for index in range(self.length):
+        newIndex = index + shift
+        if 0 <= newIndex < self.length:
+          countStart = self.stacksStart[index].count(color)
+          self._addCheck(newIndex, lambda stack, color=color, count=countStart: stack.count(color) == count)
+
+  def _compileDistribution(self, spec, source, operator, dest):
+    self._checkIndex(source, spec)
+    delta = 1 if operator == '}' else -1
+    boxes = self.stacksStart[source]
+    for index in range(len(boxes)-1,-1,-1):
+      if 0 <= dest < self.length:
+        self._addCheck(dest, lambda stack, color=boxes[index]: len(stack) > 0 and stack[-1] == color)
+      dest += delta
+
+  def _buildExample(self):
+    solution = self.yardStart
+    for _spec in self.specs:
+      if _spec[1] == ':':
+        solution = collectColorAt(solution, _spec)
+      elif _spec[1] in ['>','<']: 
+        solution = moveColor(solution, _spec)
+      elif _spec[1] in ['}','{']:
+        solution = distributeFromAt(solution, _spec)
+    return solution
+
+class CompiledDemocratie(CompiledSolution):
+  def __init__(self, yardStart):
+    CompiledSolution.__init__(self, yardStart)
+    self.winner = getDemocratieWinner(yardStart)
+    self._example = getDemocratieSolution(yardStart)
+    for index, stack in enumerate(self._example.split(',')):
+      self._addCheck(index, lambda now, stack=stack: now == stack)
+
+@lru_cache(maxsize=256)
+def compileCriteria(yardStart, criteria):
+  return CompiledCriteria(yardStart, criteria)
+
+@lru_cache(maxsize=256)
+def compileDemocratie(yardStart):
+  return CompiledDemocratie(yardStart)
+
+def compileSolution(solution, yardStart, criteria):
+  # compiled form of the solution functions of this module, None for other functions
+  if solution is hasSolution:
+    return compileCriteria(yardStart, criteria)
+  if solution is hasDemocratie:
+    return compileDemocratie(yardStart)
+  return None
 
 def moveColor(solution, spec):
   color = spec[0]
@@ -187,18 +241,9 @@ def distributeFromAt(solution, spec):
   return ','.join(stacks)
 
 def exampleSolution(yardStart, criteria):
-  solution = yardStart
-
-  if type(criteria) == str:
-    _specs = criteria.split(',')
-    for _spec in _specs:
-      if _spec[1] == ':':
-        solution = collectColorAt(solution, _spec)
-      elif _spec[1] in ['>','<']: 
-        solution = moveColor(solution, _spec)
-      elif _spec[1] in ['}','{']:
-        solution = distributeFromAt(solution, _spec)
-  return solution
+  if type(criteria) != str:
+    return yardStart
+  return compileCriteria(yardStart, criteria).example()
 
 # solution = presentSolution('rgboywpt,,,,,,,,,','0}2')
 # print(solution)
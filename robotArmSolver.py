@@ -0,0 +1,316 @@
+import io
+import time
+import heapq
+import argparse
+import contextlib
+import robotArmChallenges
+from RobotArmEngine import RobotArmEngine
+from robotArmSolutions import CompiledCriteria, CompiledDemocratie
+
+helpSolver = '''
+=================== solve challenges ===================
+
+  solveChallenge(challenge, level)
+    returns the shortest list of actions ('left', 'right', 'grab', 'drop', 'scan')
+    that reaches the solution of the challenge without errors or warnings
+
+  python robotArmSolver.py
+    solves all challenges of robotArmChallenges and compares the minimum actions
+    with the maximum actions of level 3
+
+  A* search over the arm position, the box held and the yard:
+  - between two grabs or drops the arm only moves straight, so the search steps are
+    'move to a stack and grab' or 'move to a stack and drop', costing distance + 1
+  - grabbing back the box just dropped, or dropping the box just grabbed, is pointless
+  - the estimate counts the grabs, drops and carrying distance still needed
+'''
+
+class SolverLimit(Exception):
+  pass
+
+def _prefix(a, b):
+  length = 0
+  for x, y in zip(a, b):
+    if x != y: break
+    length += 1
+  return length
+
+def _crossings(flows, work, stack, surplus = {}):
+  # minimal moves of the arm, given per stack the boxes per color it can give (+) or needs (-),
+  # whether the stack needs any grab or drop at all, and the boxes per color that are not needed:
+  # between stacks k and k+1 the arm must carry across what the other side lacks of every color,
+  # as often as it crosses one way it must cross back, unless it started on the other side,
+  # and it must cross at least once if there is work on the other side
+  length = len(flows)
+  workRight = [False] * (length + 1)
+  for index in range(length - 1, -1, -1):
+    workRight[index] = workRight[index + 1] or work[index]
+  balances = {}
+  workLeft = False
+  moves = 0
+  for gap in range(length - 1):
+    workLeft = workLeft or work[gap]
+    for color, flow in flows[gap].items():
+      balances[color] = balances.get(color, 0) + flow
+    right = 0
+    left = 0
+    for color, balance in balances.items():
+      if balance > surplus.get(color, 0):
+        right += balance - surplus.get(color, 0)
+      elif balance < 0:
+        left -= balance
+    most = max(right, left)
+    if stack <= gap:
+      if most == 0:
+        moves += workRight[gap + 1]
+      else:
+        moves += most + max(left, most - 1)
+    else:
+      if most == 0:
+        moves += workLeft
+      else:
+        moves += most + max(right, most - 1)
+  return moves
+
+class _Target:
+  # goal test and estimate of the remaining actions for a solution
+  def __init__(self, engine):
+    self.solution = engine._solution
+    self.compiled = engine._compiledSolution
+    self.yardStart = engine._yardStart
+    self.criteria = engine._criteria
+    self.stacks = None
+    self.demands = {}
+    if type(self.solution) is str:
+      self.stacks = tuple(self.solution.split(','))
+    elif isinstance(self.compiled, CompiledDemocratie):
+      self.stacks = tuple(self.compiled.example().split(','))
+    elif isinstance(self.compiled, CompiledCriteria):
+      self._setDemands()
+    self._stackEstimates = {}
+
+  def _setDemands(self):
+    # the least number of boxes per color every stack must hold in the solution
+    start = self.compiled.stacksStart
+    def demand(index, color, count):
+      if 0 <= index < len(start):
+        self.demands.setdefault(index, {})
+        self.demands[index][color] = max(count, self.demands[index].get(color, 0))
+    for operator, first, second in self.compiled.rules:
+      if operator == ':':
+        demand(second, first, self.yardStart.count(first))
+      elif operator in ['<','>']:
+        shift = second if operator == '>' else -second
+        for index in range(len(start)):
+          demand(index + shift, first, start[index].count(first))
+      elif operator in ['{','}']:
+        delta = 1 if operator == '}' else -1
+        dest = second
+        for color in reversed(start[first]):
+          demand(dest, color, 1)
+          dest += delta
+
+  def reached(self, stacks):
+    if self.stacks is not None:
+      return stacks == self.stacks
+    if self.compiled:
+      return self.compiled.check(stacks)
+    return bool(self.solution(self.yardStart, ','.join(stacks), self.criteria))
+
+  def estimate(self, stacks, stack, held):
+    if self.stacks is not None:
+      return self._estimateStacks(stacks, stack, held)
+    if self.compiled:
+      return self._estimateCriteria(stacks, stack, held)
+    return 0
+
+  def _stackEstimate(self, index, now):
+    # grabs + drops needed on a stack and its flow of boxes, cached per stack content
+    key = (index, now)
+    if key not in self._stackEstimates:
+      target = self.stacks[index]
+      correct = _prefix(now, target)
+      flow = {}
+      for color in now[correct:]:
+        flow[color] = flow.get(color, 0) + 1
+      for color in target[correct:]:
+        flow[color] = flow.get(color, 0) - 1
+      self._stackEstimates[key] = (len(now) - correct + len(target) - correct, flow)
+    return self._stackEstimates[key]
+
+  def _estimateStacks(self, stacks, stack, held):
+    actions = 0
+    flows = []
+    work = []
+    for index in range(len(stacks)):
+      count, flow = self._stackEstimate(index, stacks[index])
+      actions += count
+      flows.append(flow)
+      work.append(count > 0)
+    if held:
+      flows[stack] = dict(flows[stack])
+      flows[stack][held] = flows[stack].get(held, 0) + 1
+    return actions + _crossings(flows, work, stack)
+
+  def _estimateCriteria(self, stacks, stack, held):
+    # every box a stack lacks must be grabbed somewhere and dropped there,
+    # every failing stack needs at least one grab or drop, and a held box a drop
+    length = len(stacks)
+    work = [False] * length
+    for index in self.compiled.failing(stacks):
+      work[index] = True
+    flows = []
+    supply = {}
+    lacking = 0
+    for index in range(length):
+      flow = {}
+      for color in stacks[index]:
+        flow[color] = flow.get(color, 0) + 1
+      if held and index == stack:
+        flow[held] = flow.get(held, 0) + 1
+      for color, count in flow.items():
+        supply[color] = supply.get(color, 0) + count
+      for color, count in self.demands.get(index, {}).items():
+        flow[color] = flow.get(color, 0) - count
+        supply[color] = supply.get(color, 0) - count
+        if flow[color] < 0:
+          lacking -= flow[color]
+          work[index] = True
+      flows.append(flow)
+    actions = max(2 * lacking - (1 if held else 0), sum(work), 1 if held else 0)
+    surplus = {color: max(0, count) for color, count in supply.items()}
+    return actions + _crossings(flows, work, stack, surplus)
+
+def solve(engine, maxNodes = 2000000):
+  # shortest actions from the current state of the engine, None if the solution can not be reached
+  if not engine._solution:
+    return None
+  target = _Target(engine)
+  maxLayers = engine._maxLayers
+  length = len(engine._yard)
+  start = (engine._stack, engine._color, tuple(engine._stackStrings), True)
+  best = {start: 0}
+  parents = {start: None}
+  counter = 0
+  queue = [(target.estimate(start[2], start[0], start[1]), 0, counter, start)] # deepest first on equal estimates
+  nodes = 0
+  while queue:
+    _, cost, _, state = heapq.heappop(queue)
+    cost = -cost
+    if best.get(state, cost) < cost: continue
+    stack, held, stacks, first = state
+    if not first and not held and target.reached(stacks):
+      return _actions(parents, state)
+    nodes += 1
+    if nodes > maxNodes:
+      raise SolverLimit(f'no solution within {maxNodes} states')
+    for index in range(length):
+      if index == stack and not first: continue # grab after drop or drop after grab at the same stack
+      boxes = stacks[index]
+      if held:
+        if len(boxes) >= maxLayers: continue
+        newStacks = stacks[:index] + (boxes + held,) + stacks[index+1:]
+        newHeld = ''
+      else:
+        if not boxes: continue
+        newHeld = 't' if boxes[-1] == 'i' else boxes[-1]
+        newStacks = stacks[:index] + (boxes[:-1],) + stacks[index+1:]
+      newState = (index, newHeld, newStacks, False)
+      newCost = cost + abs(index - stack) + 1
+      if newCost < best.get(newState, newCost + 1):
+        best[newState] = newCost
+        parents[newState] = state
+        counter += 1
+        heapq.heappush(queue, (newCost + target.estimate(newStacks, index, newHeld), -newCost, counter, newState))
+  return None
+
+def _actions(parents, state):
+  actions = []
+  while parents[state] is not None:
+    previous = parents[state]
+    distance = state[0] - previous[0]
+    step = [('right' if distance > 0 else 'left')] * abs(distance)
+    step.append('drop' if previous[1] else 'grab')
+    actions = step + actions
+    state = previous
+  return actions
+
+def addScans(actions, scans):
+  # scans right after grabs, then after moves, never after a drop or another scan
+  result = []
+  for action in actions:
+    result.append(action)
+    if scans > 0 and action == 'grab':
+      result.append('scan')
+      scans -= 1
+  index = 0
+  while scans > 0 and index < len(result):
+    if result[index] in ['left','right'] and (index + 1 == len(result) or result[index + 1] != 'scan'):
+      result.insert(index + 1, 'scan')
+      scans -= 1
+    index += 1
+  return result
+
+def loadEngine(challenge, level = 3, seed = None):
+  with contextlib.redirect_stdout(io.StringIO()):
+    engine = RobotArmEngine(challenge, level, seed = seed)
+  return engine
+
+def solveChallenge(challenge, level = 3, maxNodes = 2000000, seed = None):
+  engine = loadEngine(challenge, level, seed)
+  actions = solve(engine, maxNodes)
+  if actions is not None and engine._scansMin:
+    actions = addScans(actions, engine._scansMin)
+  return actions
+
+def runActions(engine, actions):
+  with contextlib.redirect_stdout(io.StringIO()):
+    for action in actions:
+      {'left': engine.moveLeft, 'right': engine.moveRight, 'grab': engine.grab, 'drop': engine.drop, 'scan': engine.scan}[action]()
+  return engine.missionResult()
+
+def allChallenges():
+  for name in dir(robotArmChallenges):
+    challenges = getattr(robotArmChallenges, name)
+    if name == 'challenge_example':
+      yield name, challenges
+    elif name.startswith('challenges_') and type(challenges) is dict:
+      for key in sorted(challenges):
+        yield f'{name}[{key}]', challenges[key]
+
+def main(argv = None):
+  parser = argparse.ArgumentParser(description='solve robotarm challenges with a minimal number of actions', epilog=helpSolver, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('--seed', type=int, default=0, help='random seed for challenges with random boxes')
+  parser.add_argument('--nodes', type=int, default=2000000, help='maximum number of states to search per challenge')
+  args = parser.parse_args(argv)
+
+  total = time.perf_counter()
+  print(f'{"challenge":32} {"name":32} {"actions":>7} {"budget":>6} {"seconds":>8}  remark')
+  for label, challenge in allChallenges():
+    engine = loadEngine(challenge, 3, args.seed)
+    budget = engine._limitActions
+    started = time.perf_counter()
+    remark = ''
+    try:
+      actions = solveChallenge(challenge, 3, args.nodes, args.seed)
+    except SolverLimit as error:
+      actions = None
+      remark = str(error)
+    seconds = time.perf_counter() - started
+    if actions is None:
+      count = '-'
+      remark = remark or 'no solution'
+    else:
+      count = len(actions)
+      state, fails = runActions(loadEngine(challenge, 3, args.seed), actions)
+      if state != 'ACCOMPLISHED' and fails != ['too many code lines']:
+        remark = 'replay failed: ' + ', '.join(fails)
+      elif budget and count > budget:
+        remark = 'budget not achievable'
+      elif budget and count < budget:
+        remark = f'budget {budget - count} above minimum'
+    print(f'{label:32} {challenge.get("name",""):32} {count:>7} {str(budget or "-"):>6} {seconds:8.3f}  {remark}')
+  print(f'total {time.perf_counter() - total:.3f} seconds')
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,284 @@
+import sys
+import time
+import queue
+import atexit
+import threading
+import pygame
+from RobotArm import RobotArm, ShownState
+from RobotArmEngine import RobotArmEngine
+
+helpThreaded = '''
+=================== robotarm with a render thread ===================
+
+  robotArm = ThreadedRobotArm(challenge, level, speed, seed, block)
+    same methods as RobotArm; the actions are done at once by the engine and their
+    animations are queued for a render thread that draws at a fixed frame rate,
+    moving the arm by the time passed, so the window keeps responding while the
+    program computes between actions
+
+  block: how long every action waits for its animation
+    None    until the animation is shown, like RobotArm (default)
+    0       not at all: the program runs ahead, the animations follow
+    0.05    at most 0.05 seconds
+
+  ThreadedRobotArm.renderFps = 30     frames per second of the render thread, default 60
+  ThreadedRobotArm.queueLimit = 100   animations queued before an action waits anyway
+
+  all animations are shown before the program ends; one ThreadedRobotArm per program,
+  not on macOS, where windows only work on the main thread
+'''
+
+class ThreadedRobotArm(RobotArm):
+  renderFps = 60
+  queueLimit = 1000
+  _codeFile = False # program of the arm, False: the main script
+
+  def __init__(self, challenge = RobotArm._defaultChallenge, level = 0, speed = 1, seed = None, block = None):
+    self._logic = RobotArmEngine(None, codeFile = self._codeFile) # the engine of the program; _engine is the state shown
+    self._logic.loadDims(challenge)
+    self._engine = ShownState(self._logic)
+    self._initView(speed)
+    self.block = block
+    self._animations = queue.Queue(self.queueLimit)
+    self._keys = queue.Queue() # operator keys from the render thread
+    self._sync = threading.Condition()
+    self._posted = 0 # animations queued
+    self._shown = 0 # animations done
+    self._closed = False
+    self._operating = False
+    self._item = None # animation being shown
+    self._elapsed = 0 # seconds of the animation shown
+    self._startRender()
+
+    self._logic.addObserver(self)
+    self.load(challenge, level, seed)
+
+  def _setScreen(self):
+    pass # the window belongs to the render thread
+
+  ########### PROGRAM THREAD ###########
+
+  def notify(self, engine, event, *args):
+    args = self._queuedGlide(engine, event, args)
+    if args is None: return
+    if event in ['left','right','down','up','load','hazard','solution','accuEmpty']:
+      self._post(event, args)
+    elif event == 'wait':
+      self._waitKeys()
+
+  def _post(self, event, args = ()):
+    with self._sync:
+      self._posted += 1
+    item = (event, args, ShownState(self._logic))
+    while not self._closed:
+      try:
+        self._animations.put(item, timeout = 0.1)
+        return
+      except queue.Full:
+        pass
+
+  def _waitShown(self, timeout = None):
+    # until the render thread showed all animations queued so far
+    with self._sync:
+      posted = self._posted
+      self._sync.wait_for(lambda: self._shown >= posted or self._closed, timeout)
+    if self._closed:
+      sys.exit()
+
+  def _act(self, method, *args):
+    if self._closed:
+      sys.exit()
+    result = method(*args)
+    if self.block is None or self.block > 0:
+      self._waitShown(self.block)
+    return result
+
+  def _waitKeys(self):
+    # shows all animations, then waits for spacebar or escape
+    self._post('wait')
+    self._waitShown()
+
+  def _finish(self):
+    # at the end of the program: show what is still queued
+    with self._sync:
+      posted = self._posted
+      self._sync.wait_for(lambda: self._shown >= posted or self._closed)
+    self._close()
+    self._thread.join(1)
+
+  def moveRight(self):
+    return self._act(self._logic.moveRight)
+
+  def moveLeft(self):
+    return self._act(self._logic.moveLeft)
+
+  def grab(self):
+    return self._act(self._logic.grab)
+
+  def drop(self):
+    return self._act(self._logic.drop)
+
+  def scan(self):
+    return self._act(self._logic.scan)
+
+  def execute(self, actions, strict = False):
+    return self._act(self._logic.execute, actions, strict)
+
+  def stackEmpty(self):
+    return self._logic.stackEmpty()
+
+  def stackIndex(self):
+    return self._logic.stackIndex()
+
+  def load(self, challenge = RobotArm._defaultChallenge, level = 0, seed = None):
+    return self._logic.load(challenge, level, seed)
+
+  def serializeYard(self, yard):
+    return self._logic.serializeYard(yard)
+
+  def report(self):
+    self._logic.report()
+    self._waitKeys()
+
+  def wait(self):
+    self._waitKeys()
+
+  def help(self):
+    self._logic.help()
+
+  def helpChallenge(self):
+    self._logic.helpChallenge()
+
+  def showSolution(self):
+    if not self._logic.showSolution(): return
+    self._post('load')
+    self._waitKeys()
+
+  def operate(self):
+    self._logic.operate()
+    self._waitShown()
+    self._operating = True
+    try:
+      while True:
+        try:
+          command = self._keys.get(timeout = 0.1)
+        except queue.Empty:
+          if self._closed: sys.exit()
+          continue
+        if command == 'continue':
+          return
+        if command == 'down':
+          command = 'grab' if self._logic._color == self.EMPTY else 'drop'
+        count = 1
+        while command in ['left','right']:
+          with self._keys.mutex: # the render thread puts keys meanwhile; only this thread takes them
+            repeated = len(self._keys.queue) > 0 and self._keys.queue[0] == command
+          if not repeated: break
+          self._keys.get()
+          count += 1
+        self._logic.execute([command] * count)
+    finally:
+      self._operating = False
+
+  ########### RENDER THREAD ###########
+
+  def _startRender(self):
+    self._ready = threading.Event()
+    self._thread = threading.Thread(target = self._render, name = 'robotarm render', daemon = True)
+    self._thread.start()
+    self._ready.wait()
+    atexit.register(self._finish)
+
+  def _render(self):
+    pygame.init()
+    self._clock = pygame.time.Clock()
+    RobotArm._setScreen(self)
+    pygame.display.set_icon(self._getIcon())
+    self._ready.set()
+    last = time.perf_counter()
+    while not self._closed:
+      for event in pygame.event.get():
+        if event.type == pygame.QUIT:
+          self._close()
+        elif event.type == pygame.KEYDOWN and not self._renderKey(event.key):
+          self.handleSpeedEvent(event)
+      if self._closed: break
+      now = time.perf_counter()
+      self._advance(now - last)
+      last = now
+      self._drawCurrent()
+      pygame.display.update()
+      self._clock.tick(self.renderFps)
+    pygame.display.quit()
+
+  def _waiting(self):
+    return self._item is not None and self._item[0] == 'wait'
+
+  def _renderKey(self, key):
+    # spacebar, escape and the keys of the operator, False if the key is not for them
+    if key in [pygame.K_SPACE, pygame.K_ESCAPE] and (self._waiting() or self._operating):
+      if key == pygame.K_ESCAPE:
+        self._logic._aborted = True
+      if self._waiting():
+        self._done(self._item)
+        self._item = None
+      else:
+        self._keys.put('continue')
+      return True
+    if self._operating and key in self._commandKeys:
+      self._keys.put(self._commandKeys[key])
+      return True
+    return False
+
+  def _advance(self, seconds):
+    # plays the queued animations for seconds, True if the picture changed
+    changed = False
+    self._elapsed += seconds
+    while True:
+      if self._item is None:
+        try:
+          self._item = self._animations.get_nowait()
+        except queue.Empty:
+          self._elapsed = 0 # nothing to catch up with
+          break
+        self._start(self._item)
+        changed = True
+      if self._item[0] == 'wait':
+        self._elapsed = 0
+        break
+      changed = True
+      duration = self._duration(self._item)
+      if self._elapsed < duration:
+        break
+      self._elapsed -= duration
+      self._done(self._item)
+      self._item = None
+    return changed
+
+  def _drawCurrent(self):
+    if self._item:
+      self._drawAnimation(self._item[0], self._item[1], self._elapsed)
+    else:
+      self._drawState()
+
+  def _close(self):
+    with self._sync:
+      self._closed = True
+      self._sync.notify_all()
+
+  def _start(self, item):
+    event, args, shown = item
+    self._engine = shown
+    self._startAnimation(event, args)
+
+  def _duration(self, item):
+    return self._animationDuration(item[0])
+
+  def _done(self, item):
+    self._endAnimation(item[0])
+    with self._sync:
+      self._shown += 1
+      self._sync.notify_all()
+
+if __name__ == "__main__":
+  print(helpThreaded)
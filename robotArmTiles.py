@@ -0,0 +1,288 @@
+import os
+import sys
+import time
+import types
+import argparse
+import threading
+from math import ceil
+import pygame
+from RobotArm import RobotArm
+from RobotArmEngine import RobotArmEngine
+from robotArmThreaded import ThreadedRobotArm
+
+helpTiles = '''
+=================== many robotarms in one window ===================
+
+  python robotArmTiles.py submissions
+    runs every program (*.py) in the directory at the same time, each in a tile
+    of one window with its own yard, arm, accu and caption
+  python robotArmTiles.py robotarm-1.py robotarm-2.py --challenge challenges_basic[2] --level 3 --seed 1
+    runs the programs on the same challenge, level and seed, whatever they load
+
+  options:
+    --columns 8        tiles next to each other, default: what fits best
+    --size 1600x900    largest window, default: most of the screen
+    --speed 3          speed of all arms 0..5, default: the speed of the program
+    --close            close the window when all programs are done
+
+  keys:
+    spacebar           continues all arms waiting for it (blue caption), when all are done: closes the window
+    escape             aborts the waiting arms
+    up, down           speed of all arms
+
+  every program runs in its own thread with a ThreadedRobotArm drawn in its tile;
+  one loop draws all tiles at TiledView.fps and updates only the tiles that changed
+
+  view = TiledView(3)
+  view.run([solve1, solve2, solve3], ['one', 'two', 'three'])
+    runs functions in the tiles, view.arm(challenge, level, speed, seed) makes the
+    robotarm of the tile of the calling function
+'''
+
+def _scaleView(view, scale):
+  # sizes of the drawing of a RobotArm times scale, on the instance: tiles are drawn small, not scaled down
+  for name in ['_boxHeight', '_boxWidth', '_boxMargin', '_armTopHeight', '_bottomMargin', '_screenMargin', '_accuWidth', '_accuPadding']:
+    setattr(view, name, max(1, round(getattr(RobotArm, name) * scale)))
+  view._scaleFactor = scale
+
+class _ViewSize(RobotArm):
+  # size a RobotArm draws a challenge at, without loading it
+  _offscreen = True
+
+  def __init__(self, challenge, scale = 1):
+    _scaleView(self, scale)
+    self._engine = RobotArmEngine(None)
+    self._engine.loadDims(challenge)
+    self._initView(0)
+    self._setScreen()
+
+class ArmTile(ThreadedRobotArm):
+  # a ThreadedRobotArm drawn on a surface of its own, by the loop of the TiledView
+  _offscreen = True
+
+  def __init__(self, challenge = RobotArm._defaultChallenge, level = 0, speed = 1, seed = None, block = None, codeFile = False, scale = 1):
+    _scaleView(self, scale)
+    self._codeFile = codeFile
+    super().__init__(challenge, level, speed, seed, block)
+
+  def _startRender(self):
+    RobotArm._setScreen(self)
+
+  def _drawMessage(self, message, frame, gravity = 1):
+    # the hazard sign and the message as small as the tile
+    self._drawState()
+    size = max(8, round(64 * self._scaleFactor))
+    if gravity == 1:
+      sign = pygame.transform.smoothscale(self._getHazardSign()[frame % 4], (size, size))
+      self._screen.blit(sign, (self._armX - self._viewX + self._boxSpaceWidth() // 2 - size // 2, 0))
+    if frame%2 == 0 or frame >= 6:
+      text = self._getFont(max(8, round(24 * self._scaleFactor))).render(message, True, (200,50,50), self._backgroundColor)
+      self._screen.blit(text, ((self._screenWidth//2) - text.get_rect().width//2, size))
+
+  def _idle(self):
+    return self._item is None and self._animations.empty()
+
+class TiledView:
+  fps = 60
+  captionHeight = 16
+  tileMargin = 2
+  _backgroundColor = (150,150,150)
+  _captionColor = (0,0,0)
+  _errorColor = (150,0,0)
+  _waitingColor = (0,0,200) # caption of an arm waiting for the spacebar
+
+  def __init__(self, count, columns = None, size = None, challenge = RobotArm._defaultChallenge):
+    self.count = count
+    self._tiles = [None] * count
+    self._labels = [''] * count
+    self._errors = [None] * count
+    self._codeFiles = [False] * count
+    self._slotOf = {} # thread ident: slot
+    self._threads = []
+
+    pygame.init()
+    if size is None:
+      info = pygame.display.Info()
+      size = (info.current_w * 9 // 10, info.current_h * 8 // 10) if info.current_w > 0 else (1600, 900)
+    self._imageSize = _ViewSize(challenge)._screen.get_size()
+    self.columns = columns or max(range(1, count + 1), key = lambda columns: self._scale(columns, size))
+    self.rows = ceil(count / self.columns)
+    self.scale = self._scale(self.columns, size)
+    while True: # sizes are rounded to whole pixels
+      probe = _ViewSize(challenge, self.scale)
+      width, height = probe._screen.get_size()
+      if self.scale < 0.1 or (self.columns * (width + 2 * self.tileMargin) <= size[0] and self.rows * (height + self.captionHeight + 2 * self.tileMargin) <= size[1]): break
+      self.scale *= 0.95
+    self._cellSize = (width + 2 * self.tileMargin, height + self.captionHeight + 2 * self.tileMargin)
+    self._screen = pygame.display.set_mode((self.columns * self._cellSize[0], self.rows * self._cellSize[1]))
+    pygame.display.set_icon(probe._getIcon())
+    pygame.display.set_caption(f'robotarm: {count} tiles')
+    self._screen.fill(self._backgroundColor)
+    pygame.display.update()
+    self._font = probe._getFont(self.captionHeight - 4)
+
+  def _scale(self, columns, size):
+    # images smaller than a RobotArm window, not larger
+    width, height = self._imageSize
+    rows = ceil(self.count / columns)
+    return min(1, (size[0] / columns - 2 * self.tileMargin) / width, (size[1] / rows - self.captionHeight - 2 * self.tileMargin) / height)
+
+  def _cell(self, slot):
+    width, height = self._cellSize
+    return pygame.Rect(slot % self.columns * width, slot // self.columns * height, width, height)
+
+  ########### ARMS ###########
+
+  def arm(self, challenge = RobotArm._defaultChallenge, level = 0, speed = 1, seed = None, block = None):
+    # the robotarm of the tile of the calling thread, a second arm replaces the first
+    slot = self._slotOf[threading.get_ident()]
+    tile = ArmTile(challenge, level, speed, seed, block, self._codeFiles[slot], self.scale)
+    if self._tiles[slot]:
+      self._tiles[slot]._close()
+    self._tiles[slot] = tile
+    return tile
+
+  def _runSlot(self, slot, function):
+    self._slotOf[threading.get_ident()] = slot
+    try:
+      function()
+    except SystemExit:
+      pass
+    except BaseException as error:
+      self._errors[slot] = f'{type(error).__name__}: {error}'
+
+  def run(self, functions, labels = None, hold = True):
+    # every function in a thread of its own, returns when the window is closed
+    for slot, function in enumerate(functions[:self.count]):
+      if labels: self._labels[slot] = labels[slot]
+      thread = threading.Thread(target = self._runSlot, args = (slot, function), name = f'robotarm tile {slot}', daemon = True)
+      self._threads.append(thread)
+      thread.start()
+    try:
+      self._loop(hold)
+    finally:
+      for tile in self._tiles:
+        if tile: tile._close()
+      pygame.display.quit()
+
+  def runPrograms(self, programs, challenge = None, level = None, seed = None, speed = None, hold = True):
+    # programs make their RobotArm in their tile, challenge, level, seed and speed overrule theirs
+    def factory(*args, **kwargs):
+      values = dict(zip(['challenge', 'level', 'speed', 'seed'], args), **kwargs)
+      for name, value in [('challenge', challenge), ('level', level), ('speed', speed), ('seed', seed)]:
+        if value is not None: values[name] = value
+      return self.arm(**values)
+    def runner(path):
+      def runProgram():
+        with open(path) as file:
+          code = compile(file.read(), path, 'exec')
+        exec(code, {'__name__': '__main__', '__file__': path})
+      return runProgram
+    for slot, path in enumerate(programs[:self.count]):
+      self._codeFiles[slot] = path
+    shim = types.ModuleType('RobotArm')
+    shim.RobotArm = factory
+    saved = sys.modules.get('RobotArm')
+    sys.modules['RobotArm'] = shim
+    try:
+      self.run([runner(path) for path in programs], [os.path.basename(path) for path in programs], hold)
+    finally:
+      sys.modules['RobotArm'] = saved
+
+  ########### DRAWING ###########
+
+  def _caption(self, slot, tile):
+    if self._errors[slot]:
+      return (f'{self._labels[slot]}  {self._errors[slot]}', self._errorColor)
+    if tile is None:
+      return (self._labels[slot], self._captionColor)
+    _actions = tile._engine._actions
+    steps = f' [{_actions}]' if _actions > 0 else ''
+    color = self._waitingColor if tile._waiting() else self._captionColor
+    return (f'{self._labels[slot]}  {tile._engine._challengeName[0:RobotArm.MAXCAPTION]}{steps}', color)
+
+  def _drawTile(self, slot, tile, caption):
+    cell = self._cell(slot)
+    self._screen.fill(self._backgroundColor, cell)
+    text, color = caption
+    x, y = cell.left + self.tileMargin, cell.top + self.tileMargin
+    self._screen.set_clip(cell)
+    self._screen.blit(self._font.render(text, True, color), (x, y))
+    if tile:
+      tile._drawCurrent()
+      self._screen.blit(tile._screen, (x, y + self.captionHeight))
+    self._screen.set_clip(None)
+    return cell
+
+  def _loop(self, hold):
+    # one event loop and one display update per frame, for the tiles that changed
+    clock = pygame.time.Clock()
+    drawn = [None] * self.count # caption of the tile drawn, None: not drawn yet
+    done = False
+    running = None
+    last = time.perf_counter()
+    while True:
+      for event in pygame.event.get():
+        if event.type == pygame.QUIT:
+          return
+        if event.type == pygame.KEYDOWN:
+          used = [tile._renderKey(event.key) for tile in self._tiles if tile]
+          if any(used): continue
+          if done and event.key in [pygame.K_SPACE, pygame.K_ESCAPE]:
+            return
+          for tile in self._tiles:
+            if tile: tile.handleSpeedEvent(event)
+      now = time.perf_counter()
+      seconds = now - last
+      last = now
+      dirty = []
+      for slot, tile in enumerate(self._tiles):
+        changed = tile is not None and tile._advance(seconds)
+        caption = self._caption(slot, tile)
+        if changed or caption != drawn[slot]:
+          drawn[slot] = caption
+          dirty.append(self._drawTile(slot, tile, caption))
+      if dirty:
+        pygame.display.update(dirty)
+      alive = sum(thread.is_alive() for thread in self._threads)
+      if alive != running:
+        running = alive
+        pygame.display.set_caption(f'robotarm: {running} of {len(self._threads)} running' if running else 'robotarm: done, spacebar closes')
+      done = not running and all(tile is None or tile._idle() for tile in self._tiles)
+      if done and not hold:
+        return
+      clock.tick(self.fps)
+
+def main(argv = None):
+  parser = argparse.ArgumentParser(description='run robotarm programs side by side in one window', epilog=helpTiles, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('programs', nargs='+', help='programs (.py) or directories with programs')
+  parser.add_argument('--challenge', default=None, help='label of the challenge for all, like challenges_basic[2]')
+  parser.add_argument('--level', type=int, default=None, help='level for all, default: the level of the program')
+  parser.add_argument('--seed', type=int, default=None, help='seed for all, default: the seed of the program')
+  parser.add_argument('--speed', type=int, default=None, help='speed for all 0..5, default: the speed of the program')
+  parser.add_argument('--columns', type=int, default=None, help='tiles next to each other')
+  parser.add_argument('--size', default=None, help='largest window, like 1600x900')
+  parser.add_argument('--close', action='store_true', help='close when all programs are done')
+  args = parser.parse_args(argv)
+
+  programs = []
+  for path in args.programs:
+    if os.path.isdir(path):
+      programs += sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith('.py'))
+    else:
+      programs.append(path)
+  if not programs:
+    parser.error('no programs found')
+  challenge = None
+  if args.challenge:
+    import robotArmTrace
+    challenge = robotArmTrace.findChallenge(args.challenge)
+    if challenge is None:
+      parser.error(f'unknown challenge: {args.challenge}')
+  size = tuple(int(value) for value in args.size.lower().split('x')) if args.size else None
+
+  view = TiledView(len(programs), args.columns, size, challenge or RobotArm._defaultChallenge)
+  view.runPrograms(programs, challenge, args.level, args.seed, args.speed, not args.close)
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,169 @@
+import io
+import json
+import argparse
+import contextlib
+import robotArmChallenges
+from RobotArmEngine import RobotArmEngine
+from robotArmYards import Yard
+
+helpTrace = '''
+=================== record and replay traces ===================
+
+  trace = Trace('challenges_basic[2]')
+  robotArm._engine.addObserver(trace)  (or RobotArmEngine.addObserver)
+    records from the next load every action, whether it succeeded and the color scanned
+  trace.save('run.rat')
+
+  python robotArmTrace.py run.rat
+    replays the trace headless and prints the mission result
+  python robotArmTrace.py run.rat --speed 3
+    replays the trace animated at speed 0..5
+
+  file format: 'RAT' + format version, 4 bytes header length (2 bytes in format 1), header (json with challenge,
+  level, seed, engine version, start yard, arm position and lines of code),
+  then 1 byte per action: bits 0-2 action, bit 3 success, bits 4-7 color scanned
+'''
+
+MAGIC = b'RAT'
+FORMAT = 2
+LENGTH_BYTES = {1: 2, 2: 4} # bytes of the header length per format: start yards of large challenges need more than 2
+ACTIONS = ['left','right','grab','drop','scan']
+METHODS = {'left': 'moveLeft', 'right': 'moveRight', 'grab': 'grab', 'drop': 'drop', 'scan': 'scan'}
+COLORS = [''] + RobotArmEngine._colorSet # color code 0: nothing held
+
+class TraceError(Exception):
+  pass
+
+class Trace:
+  # engine observer, recording into an append-only byte string
+  def __init__(self, challenge = None):
+    self.challenge = challenge # label to find the challenge again, like 'challenges_basic[2]'
+    self.header = {}
+    self.actions = bytearray()
+
+  def notify(self, engine, event, *args):
+    if event == 'load':
+      self.header = {'challenge': self.challenge or engine._challengeName, 'level': engine._level,
+                     'seed': engine._seed if type(engine._seed) is int else None, 'version': engine.version,
+                     'start': engine._yardStart, 'stack': engine._stack, 'stacks': engine._maxStacks,
+                     'layers': engine._maxLayers, 'lines': engine._lines}
+      self.actions = bytearray()
+    elif event == 'action':
+      action, success = args[0], args[1]
+      color = args[2] if len(args) > 2 else ''
+      self.actions.append(encode(action, success, color))
+
+  def __len__(self):
+    return len(self.actions)
+
+  def __iter__(self):
+    for code in self.actions:
+      yield decode(code)
+
+  def toBytes(self):
+    header = json.dumps(self.header, separators=(',',':')).encode('utf-8')
+    return MAGIC + bytes([FORMAT]) + len(header).to_bytes(LENGTH_BYTES[FORMAT], 'big') + header + bytes(self.actions)
+
+  @classmethod
+  def fromBytes(cls, data):
+    if data[:3] != MAGIC:
+      raise TraceError('no robotarm trace')
+    if data[3] not in LENGTH_BYTES:
+      raise TraceError(f'trace format {data[3]}, only formats up to {FORMAT} supported')
+    start = 4 + LENGTH_BYTES[data[3]]
+    length = int.from_bytes(data[4:start], 'big')
+    trace = cls()
+    trace.header = json.loads(data[start:start + length].decode('utf-8'))
+    trace.challenge = trace.header.get('challenge')
+    trace.actions = bytearray(data[start + length:])
+    return trace
+
+  def save(self, path):
+    with open(path, 'wb') as file:
+      file.write(self.toBytes())
+
+  @classmethod
+  def load(cls, path):
+    with open(path, 'rb') as file:
+      return cls.fromBytes(file.read())
+
+def encode(action, success, color = ''):
+  return ACTIONS.index(action) | (8 if success else 0) | (COLORS.index(color) << 4)
+
+def decode(code):
+  return ACTIONS[code & 7], bool(code & 8), COLORS[code >> 4]
+
+def findChallenge(label):
+  # 'challenge_example' or 'challenges_basic[2]'
+  name, _, key = label.partition('[')
+  challenges = getattr(robotArmChallenges, name, None)
+  if key and isinstance(challenges, dict):
+    try:
+      return challenges.get(int(key.rstrip(']')))
+    except ValueError:
+      return None
+  return challenges if isinstance(challenges, dict) and 'start' in challenges else None
+
+def _restoreStart(engine, header):
+  # unseeded random starts are not constructed again: take the recorded start
+  if engine._yardStart != header['start']:
+    engine._yard = Yard.fromString(header['start'], engine._maxLayers)
+    engine._yardStart = header['start']
+    engine._watchYard()
+  engine._stack = header['stack']
+  engine._lines = header['lines']
+
+def replay(trace, challenge = None, speed = None):
+  # replays the actions on a new engine, headless or animated at a speed;
+  # returns the engine and the actions whose result differs from the trace
+  header = trace.header
+  challenge = challenge or findChallenge(header.get('challenge') or '')
+  if challenge is None:
+    raise TraceError(f"challenge {header.get('challenge')} not found, pass the challenge to replay")
+  if speed is None:
+    with contextlib.redirect_stdout(io.StringIO()):
+      engine = RobotArmEngine(None, codeSource = '')
+      engine.loadDims(challenge)
+      engine.load(challenge, header['level'], header['seed'])
+      _restoreStart(engine, header)
+    arm = engine
+  else:
+    from RobotArm import RobotArm
+    arm = RobotArm(challenge, header['level'], speed, header['seed'])
+    engine = arm._engine
+    _restoreStart(engine, header)
+    engine._notify('load')
+  differences = []
+  output = contextlib.redirect_stdout(io.StringIO()) if speed is None else contextlib.nullcontext()
+  with output:
+    for index, (action, success, color) in enumerate(trace):
+      if action == 'scan':
+        same = engine._color == color
+        arm.scan()
+      else:
+        same = bool(getattr(arm, METHODS[action])()) == success
+      if not same:
+        differences.append(index)
+  return engine, differences
+
+def main(argv = None):
+  parser = argparse.ArgumentParser(description='replay a robotarm trace', epilog=helpTrace, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('trace', help='trace file (.rat)')
+  parser.add_argument('--speed', type=int, default=None, help='animate at this speed, default: headless')
+  parser.add_argument('--challenge', default=None, help='label of the challenge, default: from the trace')
+  args = parser.parse_args(argv)
+
+  trace = Trace.load(args.trace)
+  challenge = findChallenge(args.challenge) if args.challenge else None
+  engine, differences = replay(trace, challenge, args.speed)
+  header = trace.header
+  print(f"{header['challenge']} level {header['level']} seed {header['seed']}, {len(trace)} actions, engine {header['version']}")
+  if differences:
+    print(f'replay differs from the trace at actions: {", ".join(map(str, differences[:20]))}')
+  state, fails = engine.missionResult()
+  print(state + (': ' + ', '.join(fails) if fails else ''))
+  if args.speed is not None:
+    engine._notify('wait')
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,268 @@
+import random
+import string
+from functools import lru_cache
+
+# a start spec like '3y2r,*x,#w' with symbols like 'x-rrggb,*?2,#+1,-3' is parsed once
+# into a CompiledYard, that constructs any number of yards from a random source
+
+COLOR_SYMBOLS = string.ascii_lowercase + '?'
+AMOUNT_SYMBOLS = '*#'
+COLOR_PROCESSES = '?-|><='
+AMOUNT_PROCESSES = '?+-='
+
+_RANDOM, _AMOUNT, _COLOR, _CHOICE, _DRAW, _PICK, _CYCLE = range(7)
+
+class YardSpecError(ValueError):
+  pass
+
+class CompiledYard:
+  def __init__(self, yard, symbols, colorSet, maxStacks, maxLayers):
+    self.yard = yard
+    self.symbols = symbols
+    self.colorSet = colorSet
+    self.maxStacks = maxStacks
+    self.maxLayers = maxLayers
+    self.stack = None # start position of the arm, from symbol '-3'
+    self._colorSymbols = {'?': ('?', tuple('rgbw'))}
+    self._amountSymbols = {'*': ('?', 4)}
+    for symbol in symbols.split(','):
+      self._compileSymbol(symbol)
+    self._pools = [(char, colors) for char, (process, colors) in self._colorSymbols.items() if process == '-']
+    self._reset = [(char, colors) for char, (process, colors) in self._colorSymbols.items() if process == '|']
+    self._amounts = [(char, value) for char, (process, value) in self._amountSymbols.items()]
+    self._stacks = []
+    for stack in yard.split(','):
+      ops = self._compileStack(stack)
+      single = ops[0][2] if len(ops) == 1 and ops[0][:2] == (_DRAW, 1) else None # pool of a stack of one drawn box
+      self._stacks.append((single, ops))
+    self._empty = max(0, maxStacks - len(self._stacks))
+
+  def _compileSymbol(self, symbol):
+    if symbol == '': return
+    if symbol[0] == '-':
+      if len(symbol) < 2 or symbol[1] not in string.digits:
+        raise YardSpecError(f"symbol '{symbol}': start position should be a digit")
+      self.stack = int(symbol[1])
+      return
+    if len(symbol) < 3:
+      raise YardSpecError(f"symbol '{symbol}' is too short")
+    char, process, rest = symbol[0], symbol[1], symbol[2:]
+    if char in AMOUNT_SYMBOLS:
+      if process not in AMOUNT_PROCESSES:
+        raise YardSpecError(f"symbol '{symbol}': unknown process '{process}', use one of {AMOUNT_PROCESSES}")
+      if not rest.isdigit():
+        raise YardSpecError(f"symbol '{symbol}': amount should be a number")
+      self._amountSymbols[char] = (process, int(rest))
+    elif char in COLOR_SYMBOLS:
+      if process not in COLOR_PROCESSES:
+        raise YardSpecError(f"symbol '{symbol}': unknown process '{process}', use one of {COLOR_PROCESSES}")
+      unknown = [color for color in rest if color not in self.colorSet]
+      if unknown:
+        raise YardSpecError(f"symbol '{symbol}': unknown colors {''.join(unknown)}")
+      self._colorSymbols[char] = (process, tuple(rest))
+    else:
+      raise YardSpecError(f"symbol '{symbol}': '{char}' is no color or amount symbol")
+
+  def _compileStack(self, stack):
+    # ops (kind, amount, value, extra): the amount of a color op is the number just before it,
+    # or None for the amount of a '*' or '#' before it; a number not followed by a color does nothing
+    ops = []
+    count = 1
+    for char in stack:
+      if char in string.digits:
+        count = int(char)
+        continue
+      if char in AMOUNT_SYMBOLS:
+        if char not in self._amountSymbols:
+          raise YardSpecError(f"'{char}' in start '{self.yard}' is not defined in symbols")
+        process, value = self._amountSymbols[char]
+        if process == '?':
+          ops.append((_RANDOM, None, value, None))
+        else:
+          ops.append((_AMOUNT, None, char, {'+': 1, '-': -1}.get(process, 0)))
+        count = None
+        continue
+      if char in self._colorSymbols:
+        process, colors = self._colorSymbols[char]
+        if process == '?':
+          ops.append((_CHOICE, count, colors, len(colors)))
+        elif process in '-|':
+          ops.append((_DRAW, count, char, None))
+        elif process == '=':
+          ops.append((_PICK, count, char, colors))
+        else:
+          ops.append((_CYCLE, count, char, (colors, 1 if process == '>' else -1)))
+      elif char in self.colorSet:
+        ops.append((_COLOR, count, char, None))
+      elif char in COLOR_SYMBOLS:
+        ops.append((_COLOR, count, self.colorSet[-1], None)) # pick default last of colors
+      else:
+        raise YardSpecError(f"'{char}' in start '{self.yard}' is no color, number or symbol")
+      count = 1
+    return ops
+
+  def construct(self, rng = random, maximal = False):
+    # maximal: random amounts always give their maximum (testing at level 3)
+    maxLayers = self.maxLayers
+    draw = rng.random # int(draw() * n) is a lot faster than rng.randrange(n)
+    pools = {char: list(colors) for char, colors in self._pools} # char: colors left, drawn without replacement
+    positions = {} # char: position in the colors for '>', '<' and '='
+    amounts = dict(self._amounts)
+    yard = []
+    for single, ops in self._stacks:
+      for char, colors in self._reset:
+        pools[char] = list(colors) # every stack a new color set
+      if single: # the most common stack: one box drawn from a pool
+        left = pools[single]
+        if left:
+          index = int(draw() * len(left))
+          yard.append([left[index]])
+          left[index] = left[-1]
+          left.pop()
+        else:
+          yard.append(['n'] if maxLayers else [])
+        continue
+      stack = []
+      amount = 1
+      for kind, count, value, extra in ops:
+        if count is None:
+          count = amount
+        if kind == _DRAW:
+          left = pools[value]
+          for _ in range(count):
+            if left:
+              index = int(draw() * len(left))
+              color = left[index]
+              left[index] = left[-1]
+              left.pop()
+            else:
+              color = 'n' # all colors drawn
+            if len(stack) < maxLayers:
+              stack.append(color)
+        elif kind == _COLOR:
+          stack.extend(value for _ in range(min(count, maxLayers - len(stack))))
+        elif kind == _CHOICE:
+          for _ in range(count):
+            color = value[int(draw() * extra)]
+            if len(stack) < maxLayers:
+              stack.append(color)
+        elif kind == _RANDOM:
+          amount = value if maximal else int(draw() * (value + 1))
+        elif kind == _AMOUNT:
+          amount = amounts[value]
+          amounts[value] = max(0, amount + extra)
+        elif kind == _PICK:
+          if value not in positions:
+            positions[value] = int(draw() * len(extra))
+          stack.extend(extra[positions[value]] for _ in range(min(count, maxLayers - len(stack))))
+        else:
+          colors, step = extra
+          position = positions.get(value, 0)
+          for _ in range(count):
+            if len(stack) < maxLayers:
+              stack.append(colors[position])
+            position = (position + step) % len(colors)
+          positions[value] = position
+      yard.append(stack)
+    yard.extend([] for _ in range(self._empty))
+    return yard
+
+  def sample(self, rng = random, maximal = False):
+    return ','.join(map(''.join, self.construct(rng, maximal)))
+
+  def samples(self, count, rng = random, maximal = False):
+    for _ in range(count):
+      yield self.sample(rng, maximal)
+
+@lru_cache(maxsize=256)
+def compileYard(yard, symbols = '', colorSet = 'wrgbyponitl', maxStacks = 10, maxLayers = 8):
+  return CompiledYard(yard, symbols, colorSet, maxStacks, maxLayers)
+
+class Yard:
+  # the boxes as a byte matrix, stack after stack, with the height of every stack
+  __slots__ = ('layers', 'boxes', 'heights')
+
+  def __init__(self, stacks = 0, layers = 8):
+    if layers > 255:
+      raise ValueError(f'{layers} layers, at most 255 layers supported')
+    self.layers = layers
+    self.boxes = bytearray(stacks * layers)
+    self.heights = bytearray(stacks)
+
+  @classmethod
+  def fromStacks(cls, stacks, layers = 8):
+    # stacks: lists or strings of colors; layers grow to the highest stack
+    yard = cls(len(stacks), max([layers] + [len(stack) for stack in stacks]))
+    for index, stack in enumerate(stacks):
+      boxes = ''.join(stack).encode('ascii')
+      start = index * yard.layers
+      yard.boxes[start:start + len(boxes)] = boxes
+      yard.heights[index] = len(boxes)
+    return yard
+
+  @classmethod
+  def fromString(cls, yard, layers = 8):
+    return cls.fromStacks(yard.split(','), layers)
+
+  def __len__(self):
+    return len(self.heights)
+
+  def __getitem__(self, stack):
+    # the boxes of a stack as a string, bottom first
+    if stack < 0:
+      stack += len(self.heights)
+    if not 0 <= stack < len(self.heights):
+      raise IndexError('stack index out of range')
+    start = stack * self.layers
+    return self.boxes[start:start + self.heights[stack]].decode('ascii')
+
+  def __iter__(self):
+    for stack in range(len(self.heights)):
+      yield self[stack]
+
+  def height(self, stack):
+    return self.heights[stack]
+
+  def push(self, stack, color):
+    height = self.heights[stack]
+    if height >= self.layers:
+      raise IndexError(f'stack {stack} is full')
+    self.boxes[stack * self.layers + height] = ord(color)
+    self.heights[stack] = height + 1
+
+  def pop(self, stack):
+    height = self.heights[stack] - 1
+    if height < 0:
+      raise IndexError(f'stack {stack} is empty')
+    index = stack * self.layers + height
+    color = chr(self.boxes[index])
+    self.boxes[index] = 0
+    self.heights[stack] = height
+    return color
+
+  def copy(self):
+    yard = Yard.__new__(Yard)
+    yard.layers = self.layers
+    yard.boxes = self.boxes[:]
+    yard.heights = self.heights[:]
+    return yard
+
+  def key(self):
+    # immutable snapshot, for sets and dicts
+    return bytes(self.heights) + bytes(self.boxes)
+
+  def __eq__(self, other):
+    return isinstance(other, Yard) and self.layers == other.layers and self.heights == other.heights and self.boxes == other.boxes
+
+  def __hash__(self):
+    # of the current boxes: do not change a yard while it is a key
+    return hash((self.layers, self.key()))
+
+  def serialize(self):
+    return ','.join(self)
+
+  def toLists(self):
+    return [list(stack) for stack in self]
+
+  def __repr__(self):
+    return f'Yard.fromString({self.serialize()!r}, {self.layers})'
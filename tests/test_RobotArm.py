@@ -0,0 +1,22 @@
+import pygame
+import pytest
+import robotArmChallenges
+from RobotArm import RobotArm
+
+class OffscreenArm(RobotArm):
+  _offscreen = True
+
+def _screenBytes(arm):
+  return pygame.image.tobytes(arm._screen, 'RGB')
+
+@pytest.mark.parametrize('speed', [1, RobotArm.TURBO])
+def test_showSolutionIsDrawn(speed):
+  arm = OffscreenArm(robotArmChallenges.challenges_basic[2], 0, speed)
+  arm.moveRight()
+  started = arm._now()
+  arm.showSolution()
+  shown = _screenBytes(arm)
+  arm._drawState()
+  assert shown == _screenBytes(arm)
+  if speed != RobotArm.TURBO:
+    assert arm._now() - started >= RobotArm._idleAnimationTime / 1000
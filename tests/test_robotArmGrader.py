@@ -0,0 +1,48 @@
+import time
+import pytest
+import robotArmGrader
+
+def _submission(tmp_path, name, code):
+  path = tmp_path / name
+  path.write_text(code)
+  return str(path)
+
+def test_bareExceptLoopTimesOut(tmp_path, monkeypatch):
+  monkeypatch.setattr(robotArmGrader, 'TIMEOUT_MARGIN', 0.5)
+  path = _submission(tmp_path, 'stubborn.py', '''
+from RobotArm import RobotArm
+robotArm = RobotArm('exercise 1')
+while True:
+  try:
+    while True:
+      pass
+  except:
+    pass
+''')
+  started = time.perf_counter()
+  rows = list(robotArmGrader.gradeRuns([path], 'challenges_basic', [1], timeout = 0.5, workers = 1))
+  assert time.perf_counter() - started < 10
+  assert [row['result'] for row in rows] == ['TIMEOUT']
+
+def test_runsAfterATimeoutAreGraded(tmp_path, monkeypatch):
+  monkeypatch.setattr(robotArmGrader, 'TIMEOUT_MARGIN', 0.5)
+  stubborn = _submission(tmp_path, 'a.py', 'while True:\n  try:\n    pass\n  except:\n    pass\n')
+  nothing = _submission(tmp_path, 'b.py', 'print("no robotarm")\n')
+  rows = list(robotArmGrader.gradeRuns([stubborn, nothing], 'challenges_basic', [1, 2], timeout = 0.5, workers = 2))
+  assert [(row['submission'], row['challenge'], row['result']) for row in rows] == [
+    ('a.py', 1, 'TIMEOUT'), ('a.py', 2, 'TIMEOUT'), ('b.py', 1, 'NO ROBOTARM'), ('b.py', 2, 'NO ROBOTARM')]
+
+def test_unknownChallenge(tmp_path, capsys):
+  path = _submission(tmp_path, 'a.py', '')
+  with pytest.raises(ValueError):
+    list(robotArmGrader.gradeRuns([path], 'challenges_basic', [0]))
+  with pytest.raises(SystemExit):
+    robotArmGrader.main([path, 'challenges_basic', '--challenge', '0'])
+  assert 'unknown challenges in challenges_basic: 0' in capsys.readouterr().err
+
+def test_importsNextToTheSubmission(tmp_path):
+  _submission(tmp_path, 'helper_of_a.py', 'def solve(robotArm):\n  robotArm.moveRight()\n')
+  path = _submission(tmp_path, 'a.py', 'from RobotArm import RobotArm\nfrom helper_of_a import solve\nsolve(RobotArm())\n')
+  rows = list(robotArmGrader.gradeRuns([path], 'challenges_basic', [1], timeout = 5, workers = 1))
+  assert rows[0]['result'] != 'CRASHED', rows[0]['reasons']
+  assert rows[0]['actions'] == 1
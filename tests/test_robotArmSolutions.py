@@ -0,0 +1,137 @@
+import random
+import pytest
+import robotArmChallenges
+import robotArmSolutions
+from robotArmSolutions import hasSolution, hasDemocratie, exampleSolution, compileCriteria, compileSolution
+from robotArmYards import compileYard
+
+def _oldHasColorNotAt(yardStart, yardNow, spec):
+  color = spec[0]
+  indexNow = int(spec[2:])
+  _yardNow = yardNow.split(',')
+  return 0 <= indexNow < len(_yardNow) and _yardNow[indexNow].count(color) == 0
+
+def _oldHasColorCollectedAt(yardStart, yardNow, spec):
+  color = spec[0]
+  indexNow = int(spec[2:])
+  _yardNow = yardNow.split(',')
+  return 0 <= indexNow < len(_yardNow) and _yardNow[indexNow].count(color) == yardStart.count(color)
+
+def _oldHasColorMoved(yardStart, yardNow, spec):
+  color = spec[0]
+  shift = int(spec[2]) * (-1 if spec[1] == '<' else 1)
+  _yardStart = yardStart.split(',')
+  _yardNow = yardNow.split(',')
+  for index in range(len(_yardStart)):
+    newIndex = index + shift
+    if 0 <= newIndex < len(_yardStart) and _yardStart[index].count(color) != _yardNow[newIndex].count(color):
+      return False
+  return True
+
+def _oldHasDistributedFromAt(yardStart, yardNow, spec):
+  source, dest = int(spec[0]), int(spec[2])
+  delta = 1 if spec[1] == '}' else -1
+  _yardStart = yardStart.split(',')
+  _yardNow = yardNow.split(',')
+  for index in range(len(_yardStart[source])-1,-1,-1):
+    color = _yardStart[source][index]
+    if 0 <= dest < len(_yardNow):
+      if len(_yardNow[dest]) == 0 or color != _yardNow[dest][-1]:
+        return False
+    dest += delta
+  return True
+
+def _oldHasSolution(yardStart, yardNow, criteria):
+  # robotArmSolutions.hasSolution before the criteria were compiled, as a reference
+  checks = {':': _oldHasColorCollectedAt, '}': _oldHasDistributedFromAt, '{': _oldHasDistributedFromAt,
+            '>': _oldHasColorMoved, '<': _oldHasColorMoved, '-': _oldHasColorNotAt}
+  checked = False
+  for spec in criteria.split(','):
+    if spec[1] in checks:
+      if not checks[spec[1]](yardStart, yardNow, spec):
+        return False
+      checked = True
+  return checked
+
+def _oldHasDemocratie(yardStart, yardNow):
+  return yardNow == robotArmSolutions.getDemocratieSolution(yardStart)
+
+def _shuffled(yard, rng, moves):
+  # the yard after some moves of a box from one spot to another
+  stacks = yard.split(',')
+  for _ in range(moves):
+    sources = [index for index, stack in enumerate(stacks) if stack]
+    if not sources: break
+    source = rng.choice(sources)
+    dest = rng.randrange(len(stacks))
+    box = stacks[source][-1]
+    stacks[source] = stacks[source][:-1]
+    stacks[dest] += box
+  return ','.join(stacks)
+
+def _yards(start, symbols, rng, count):
+  compiled = compileYard(start, symbols, 'wrgbyponitl', 10, 8)
+  return [compiled.sample(rng) for _ in range(count)]
+
+def _criteriaChallenges():
+  for name in ['challenges_beginner', 'challenges_basic', 'challenges_intermediate', 'challenges_advanced']:
+    for key, challenge in getattr(robotArmChallenges, name).items():
+      if challenge['solution'] is hasSolution:
+        yield f'{name}[{key}]', challenge['start'], challenge.get('symbols', ''), challenge['criteria']
+
+CRITERIA = list(_criteriaChallenges()) + [
+  ('not at', 'x,x,x,x,x,x,x,x,x,', 'x-rrrgggbbby', 'r-3,g-0'),
+  ('moved right', 'x,x,x,x,x,x,x,x,x,', 'x-rrrgggbbby', 'b>2'),
+  ('moved left', 'x,x,x,x,x,x,x,x,x,', 'x-rrrgggbbby', 'y<1,g:0'),
+  ('distributed right', '???*?,,,,,,,,,', '', '0}4'),
+  ('distributed left', ',,,,,,,,,???*?', '', '9{8'),
+  ('distributed past the end', '???*?,,,,,,,,,', '', '0}8'),
+]
+
+@pytest.mark.parametrize('name, start, symbols, criteria', CRITERIA, ids = [spec[0] for spec in CRITERIA])
+def test_sameResultsAsTheInterpreter(name, start, symbols, criteria):
+  rng = random.Random(name)
+  results = set()
+  for yardStart in _yards(start, symbols, rng, 50):
+    example = exampleSolution(yardStart, criteria)
+    for moves in [0, 0, 1, 1, 2, 5, 20]:
+      yardNow = _shuffled(rng.choice([example, yardStart]), rng, moves)
+      result = hasSolution(yardStart, yardNow, criteria)
+      assert result == _oldHasSolution(yardStart, yardNow, criteria), (yardStart, yardNow)
+      assert compileSolution(hasSolution, yardStart, criteria).check(yardNow.split(',')) == result
+      results.add(result)
+  assert results == {True, False}
+
+def test_sameDemocratieAsTheInterpreter():
+  challenge = robotArmChallenges.challenges_advanced[5]
+  rng = random.Random(5)
+  results = set()
+  for yardStart in _yards(challenge['start'], challenge['symbols'], rng, 50):
+    example = robotArmSolutions.getDemocratieSolution(yardStart)
+    for moves in [0, 0, 1, 2, 5]:
+      yardNow = _shuffled(rng.choice([example, yardStart]), rng, moves)
+      result = hasDemocratie(yardStart, yardNow)
+      assert result == _oldHasDemocratie(yardStart, yardNow), (yardStart, yardNow)
+      results.add(result)
+  assert results == {True, False}
+
+def test_failingStacks():
+  compiled = compileCriteria('r,g,rb', 'r:0,b:2')
+  assert compiled.failing('r,g,rb'.split(',')) == {0}
+  assert compiled.failing('g,r,r'.split(',')) == {0, 2}
+  assert compiled.failing('rr,g,b'.split(',')) == set()
+  assert not compiled.check('rr,g,b,'.split(','))
+
+@pytest.mark.parametrize('criteria', ['', 'r:12', 'r-10', '12}0', 'r?3', 'r:', 'rr:3', '2}', 'r:1,,b:2'])
+def test_malformedCriteria(criteria):
+  with pytest.raises(ValueError):
+    compileCriteria('r,g,b,,,,,,,', criteria)
+  with pytest.raises(ValueError):
+    hasSolution('r,g,b,,,,,,,', 'r,g,b,,,,,,,', criteria)
+
+def test_malformedSpecIsNoSolution():
+  assert robotArmSolutions.hasColorCollectedAt('r,g', 'r,g', 'r:5') is False
+  assert robotArmSolutions.hasDistributedFromAt('r,g', 'r,g', 'x}1') is False
+  assert hasSolution('r,g', 'r,g', None) is False
+  with pytest.raises(ValueError):
+    compileCriteria('r,g', None)
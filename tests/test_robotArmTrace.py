@@ -0,0 +1,37 @@
+import io
+import contextlib
+from RobotArmEngine import RobotArmEngine
+from robotArmTrace import Trace, replay
+import robotArmTrace
+
+def _record(challenge, moves):
+  trace = Trace()
+  with contextlib.redirect_stdout(io.StringIO()):
+    engine = RobotArmEngine(None, codeSource = '')
+    engine.addObserver(trace)
+    engine.loadDims(challenge)
+    engine.load(challenge, 0)
+    for move in moves:
+      getattr(engine, move)()
+  return trace
+
+def test_roundTripLargeYard():
+  challenge = {'name': 'large', 'stacks': 5000, 'layers': 20, 'start': ','.join(['rgbywrgbywrgby'] * 5000), 'solution': ''}
+  trace = _record(challenge, ['grab', 'moveRight', 'drop', 'scan'])
+  data = trace.toBytes()
+  assert len(trace.header['start']) > 0xffff
+  loaded = Trace.fromBytes(data)
+  assert loaded.header == trace.header
+  assert list(loaded) == list(trace)
+  engine, differences = replay(loaded, challenge)
+  assert differences == []
+  assert engine._yardStart == challenge['start']
+
+def test_readsFormat1():
+  challenge = {'name': 'small', 'start': 'r,g,b', 'solution': 'g,r,b'}
+  trace = _record(challenge, ['grab', 'moveRight', 'drop'])
+  header = trace.toBytes()[4 + robotArmTrace.LENGTH_BYTES[robotArmTrace.FORMAT]:-len(trace)]
+  data = b'RAT' + bytes([1]) + len(header).to_bytes(2, 'big') + header + bytes(trace.actions)
+  loaded = Trace.fromBytes(data)
+  assert loaded.header == trace.header
+  assert list(loaded) == list(trace)
@@ -0,0 +1,145 @@
+import random
+import string
+import pytest
+import robotArmChallenges
+from robotArmYards import compileYard, YardSpecError
+
+COLORS = 'wrgbyponitl'
+
+def _oldConstructYard(yard, symbols, rng, maximal = False, colorSet = COLORS, maxStacks = 10, maxLayers = 8):
+  # RobotArmEngine.constructYard before the yards were compiled, as a reference
+  colorSymbols = string.ascii_lowercase + '?'
+  amountSymbols = '*#'
+  _symbols = {}
+  _symbols['?'] = {'colors' : list('rgbw'), 'proces': '?'}
+  _symbols['*'] = {'value' : 4, 'proces': '?'}
+  for symbol in symbols.split(','):
+    if len(symbol) < 3: continue
+    if symbol[0] in amountSymbols and symbol[2] in string.digits:
+      _symbols[symbol[0]] = {'value' : int(symbol[2]), 'proces': symbol[1]}
+    if symbol[0] in colorSymbols:
+      colorset = ''.join(c for c in symbol[2:] if c in colorSet) or colorSet
+      _symbols[symbol[0]] = {'value': False, 'colors' : list(colorset), 'proces': symbol[1], 'reset': list(colorset)}
+  _yard = []
+  for stack in yard.split(','):
+    _stack = []
+    amountBoxes = 1
+    for char in _symbols:
+      if _symbols[char]['proces'] == '|':
+        _symbols[char]['colors'] = _symbols[char]['reset'] + []
+    for char in stack:
+      if char in colorSymbols:
+        for _ in range(amountBoxes):
+          if char in _symbols:
+            if _symbols[char]['proces'] == '?':
+              color = rng.choice(_symbols[char]['colors'])
+            elif _symbols[char]['proces'] in ['-','|']:
+              color = rng.choice(_symbols[char]['colors'])
+              _symbols[char]['colors'].remove(color)
+              if len(_symbols[char]['colors']) == 0:
+                _symbols[char]['colors'].append('n')
+            elif _symbols[char]['proces'] == '>':
+              color = _symbols[char]['colors'][_symbols[char]['value']]
+              _symbols[char]['value'] = (_symbols[char]['value']+1) % len(_symbols[char]['colors'])
+            elif _symbols[char]['proces'] == '<':
+              color = _symbols[char]['colors'][_symbols[char]['value']]
+              _symbols[char]['value'] = (_symbols[char]['value']-1+len(_symbols[char]['colors'])) % len(_symbols[char]['colors'])
+            elif _symbols[char]['proces'] == '=':
+              if _symbols[char]['value'] == False:
+                _symbols[char]['value'] = rng.randint(0,len(_symbols[char]['colors'])-1)
+              color = _symbols[char]['colors'][_symbols[char]['value']]
+          elif char in colorSet:
+            color = char
+          else:
+            color = colorSet[-1]
+          if len(_stack) < maxLayers:
+            _stack.append(color)
+        amountBoxes = 1
+      elif char in string.digits:
+        amountBoxes = int(char)
+      elif char in amountSymbols and char in _symbols:
+        if _symbols[char]['proces'] == '?':
+          amountBoxes = _symbols[char]['value'] if maximal else rng.randint(0,_symbols[char]['value'])
+        else:
+          amountBoxes = _symbols[char]['value']
+          if _symbols[char]['proces'] == '+':
+            _symbols[char]['value'] += 1
+          if _symbols[char]['proces'] == '-':
+            _symbols[char]['value'] = max(0, _symbols[char]['value'] - 1)
+    _yard.append(_stack)
+  while len(_yard) < maxStacks:
+    _yard.append([])
+  return _yard
+
+def _challenges():
+  for name in ['challenge_example', 'challenges_beginner', 'challenges_basic', 'challenges_intermediate', 'challenges_advanced']:
+    challenges = getattr(robotArmChallenges, name)
+    for key, challenge in ([(None, challenges)] if 'start' in challenges else challenges.items()):
+      yield f'{name}[{key}]', challenge['start'], challenge.get('symbols', '')
+
+SPECS = list(_challenges()) + [
+  ('draw per stack', '3x,3x,3x', 'x|rgb'),
+  ('drawn empty', '4x,2x', 'x-rg'),
+  ('cycle right', '3x,2x,4x', 'x>rgb'),
+  ('cycle left', '3x,2x,4x', 'x<rgb'),
+  ('growing amount', '#y,#y,#y,#y', '#+2'),
+  ('shrinking amount', '#r,#r,#r,#r', '#-3'),
+  ('random amounts', '*?,*?,*b', ''),
+  ('random colors', '3x,3x', 'x?ryb'),
+  ('too high', '9r,5w4b', ''),
+  ('unknown letter', 'rz,a', ''),
+]
+
+def _supports(yards):
+  # what can come out: colors per spot and layer, heights per spot
+  positions, heights = set(), set()
+  for yard in yards:
+    for stack, boxes in enumerate(yard):
+      heights.add((stack, len(boxes)))
+      positions.update((stack, layer, color) for layer, color in enumerate(boxes))
+  return positions, heights
+
+def _averages(yards):
+  # boxes of every color in a yard, on average
+  boxes = ''.join(''.join(''.join(stack) for stack in yard) for yard in yards)
+  return {color: boxes.count(color) / len(yards) for color in COLORS + 'n'}
+
+@pytest.mark.parametrize('name, start, symbols', SPECS, ids = [spec[0] for spec in SPECS])
+@pytest.mark.parametrize('maximal', [False, True])
+def test_sameYardsAsTheInterpreter(name, start, symbols, maximal):
+  compiled = compileYard(start, symbols, COLORS, 10, 8)
+  old = [_oldConstructYard(start, symbols, random.Random(seed), maximal) for seed in range(2000)]
+  new = [compiled.construct(random.Random(seed), maximal) for seed in range(2000)]
+  if all(yard == old[0] for yard in old): # nothing random: the very same yard
+    assert all(yard == old[0] for yard in new)
+  else:
+    assert _supports(new) == _supports(old)
+    averages = _averages(new)
+    for color, average in _averages(old).items():
+      assert averages[color] == pytest.approx(average, abs = 0.15)
+
+def test_pickOnce():
+  compiled = compileYard('3x,3x', 'x=rgb', COLORS, 10, 8)
+  yards = [compiled.sample(random.Random(seed)) for seed in range(100)]
+  assert {yard.replace(',', '') for yard in yards} == {'rrrrrr', 'gggggg', 'bbbbbb'}
+
+def test_dims():
+  assert len(compileYard('r,g', '', COLORS, 12, 8).construct()) == 12
+  assert compileYard('r,g', 'x-rg,-3', COLORS, 10, 8).stack == 3
+  assert compileYard('r', '', COLORS, 10, 8).stack is None
+
+@pytest.mark.parametrize('start, symbols', [
+  ('x', 'x-'),        # too short
+  ('x', 'x%rg'),      # unknown color process
+  ('x', 'x-rq'),      # unknown color
+  ('#r', '#+a'),      # amount is no number
+  ('#r', '#%2'),      # unknown amount process
+  ('r', '-a'),        # start position is no digit
+  ('r', '3-rg'),      # no symbol
+  ('#r', ''),         # '#' not defined
+  ('r!', ''),         # no color, number or symbol
+])
+def test_specErrors(start, symbols):
+  with pytest.raises(YardSpecError):
+    compileYard(start, symbols, COLORS, 10, 8)
+  assert issubclass(YardSpecError, ValueError)